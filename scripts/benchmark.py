@@ -0,0 +1,203 @@
+import argparse
+import json
+import platform
+import sys
+from itertools import product
+from math import ceil
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+import numpy as np
+
+from ostinato.siatec import ENGINES, siatec
+
+SIZES = (50, 100, 200, 400)
+DENSITIES = (0.05, 0.25, 0.75)
+REGULARITIES = (0.0, 0.5, 0.9)
+
+# Keyword arguments of siatec for every benchmarked engine
+MODES = {name: dict(engine=name) for name in ENGINES}
+MODES["parallel"] = dict(workers=2)
+MODES["auto"] = dict(engine="auto")
+
+# Relative slowdown or memory growth over the baseline that is reported
+THRESHOLD = 0.25
+
+# Runs faster than this are too noisy to compare
+MIN_SECONDS = 0.05
+
+# Results of the default sweep that every run is compared against. After a
+# change that is meant to move the numbers, or on a new machine, refresh it
+# with ``python scripts/benchmark.py --output scripts/benchmark_baseline.json
+# --baseline none`` and commit the file along with the change.
+BASELINE = Path(__file__).with_name("benchmark_baseline.json")
+
+
+def make_dataset(size, density, regularity, seed, height=12):
+    """Build a reproducible point set on a ``height`` tall grid.
+
+    :param density: [float] fraction of the grid cells holding a point
+    :param regularity: [float] fraction of the points that belong to
+        translated copies of one planted motif, the rest is uniform noise
+    """
+    rng = np.random.default_rng(seed)
+    width = max(1, ceil(size / (height * density)))
+    points = set()
+
+    motif_width = min(width, 8)
+    motif = set(
+        zip(
+            rng.integers(0, motif_width, 6).tolist(),
+            rng.integers(0, height // 2, 6).tolist(),
+        )
+    )
+    # Narrow grids may hold fewer distinct copies than requested
+    for _ in range(size):
+        if len(points) >= int(size * regularity):
+            break
+        dx = int(rng.integers(0, max(1, width - motif_width)))
+        dy = int(rng.integers(0, height - height // 2))
+        points |= {(x + dx, y + dy) for x, y in motif}
+
+    while len(points) < size:
+        points.add((int(rng.integers(0, width)), int(rng.integers(0, height))))
+    return sorted(points)[:size]
+
+
+def iter_cases(sizes, densities, regularities, modes, seed):
+    for size, density, regularity in product(sizes, densities, regularities):
+        for mode in modes:
+            name = f"{mode}/n={size}/d={density}/r={regularity}"
+            yield dict(
+                name=name,
+                mode=mode,
+                size=size,
+                density=density,
+                regularity=regularity,
+                seed=seed,
+            )
+
+
+def run_case(case, repeats):
+    D = make_dataset(
+        case["size"], case["density"], case["regularity"], case["seed"]
+    )
+    options = MODES[case["mode"]]
+    times = list()
+    for _ in range(repeats):
+        start = perf_counter()
+        TECs = siatec(D, **options)
+        times.append(perf_counter() - start)
+
+    # Memory is traced in a separate run, tracing slows the timed ones
+    _, stats = siatec(D, stats=True, **options)
+    peak = max([p.peak_bytes for p in stats.phases.values()], default=0)
+    return dict(
+        case,
+        seconds=min(times),
+        median_seconds=median(times),
+        peak_bytes=peak,
+        num_tecs=len(TECs),
+    )
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """List the regressions of ``results`` against ``baseline``.
+
+    A case regresses when it finds a different number of TECs, runs more
+    than ``threshold`` slower or peaks more than ``threshold`` higher in
+    memory than its baseline.
+    """
+    reference = {r["name"]: r for r in baseline["results"]}
+    regressions = list()
+    for result in results["results"]:
+        base = reference.get(result["name"])
+        if base is None:
+            continue
+        name = result["name"]
+        if result["num_tecs"] != base["num_tecs"]:
+            regressions.append(
+                f"{name}: found {result['num_tecs']} TECs, "
+                f"baseline found {base['num_tecs']}"
+            )
+        if max(result["seconds"], base["seconds"]) >= MIN_SECONDS:
+            ratio = result["seconds"] / max(base["seconds"], 1e-9)
+            if ratio > 1 + threshold:
+                regressions.append(f"{name}: {ratio:.2f}x slower")
+        if base["peak_bytes"]:
+            ratio = result["peak_bytes"] / base["peak_bytes"]
+            if ratio > 1 + threshold:
+                regressions.append(f"{name}: {ratio:.2f}x more memory")
+    return regressions
+
+
+def main(args):
+    cases = list(
+        iter_cases(
+            args.sizes,
+            args.densities,
+            args.regularities,
+            args.modes,
+            args.seed,
+        )
+    )
+    results = dict(
+        meta=dict(
+            python=platform.python_version(),
+            numpy=np.__version__,
+            machine=platform.machine(),
+            repeats=args.repeats,
+        ),
+        results=list(),
+    )
+    for case in cases:
+        result = run_case(case, args.repeats)
+        results["results"].append(result)
+        print(
+            f"{result['name']:<40} {result['seconds']:9.4f}s "
+            f"{result['peak_bytes'] / 2**20:9.2f}MB "
+            f"{result['num_tecs']:8d} TECs"
+        )
+
+    if args.output is not None:
+        with open(args.output, "w") as outfile:
+            json.dump(results, outfile, indent=2)
+
+    if args.baseline != "none":
+        with open(args.baseline) as infile:
+            baseline = json.load(infile)
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog="SIATEC benchmarks",
+        description="Time every SIATEC engine on seeded synthetic datasets and compare the results against a stored baseline.",
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument(
+        "--densities", type=float, nargs="+", default=list(DENSITIES)
+    )
+    parser.add_argument(
+        "--regularities", type=float, nargs="+", default=list(REGULARITIES)
+    )
+    parser.add_argument(
+        "--modes", nargs="+", choices=list(MODES), default=list(MODES)
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument(
+        "--baseline",
+        default=str(BASELINE),
+        help="JSON results of an earlier run, exits with an error if any case regressed. Pass none to skip the comparison.",
+    )
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args()
+    main(args)
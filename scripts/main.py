@@ -1,12 +1,12 @@
-import src.ostinato.siatec as siatec
-import src.ostinato.hashtec as hashtec
-import tests.synthetic_tests as synth_tests
-import src.ostinato.utils as util
+import ostinato.siatec as siatec
+import ostinato.hashtec as hashtec
+import ostinato.utils as util
 from time import time
 from os.path import join
 from os import listdir
 
-from src.ostinato.music_parser import XMLParser
+from benchmark import make_dataset
+from ostinato.music_elements import Score
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -55,24 +55,21 @@ def musicCompTest():
         if "Charlie Parker" in filename:
             parker_files.append(join(PARKER_ROOT, filename))
 
-    filename = join(PARKER_ROOT, "be_bop/Charlie Parker - Donna_Lee.xml")
     parker_files = parker_files[:2]
-    siaResults = list()
-    hashResults = list()
     pieceNames = list()
-    numPieces = len(parker_files)
-    parser = XMLParser()
+    datasets = list()
     for filename in parker_files:
         piecename = filename[filename.rfind(" - ") + 3: filename.rfind(".xml")]
         pieceNames.append(piecename)
         print("Creating note dataset for {}".format(piecename))
 
-        (_, parts) = parser.parse_score(filepath=filename)
-        dataset = util.pitch_dataset(parts[0]["melody"])
-        siaTecOutput = siatec.siatec(dataset)
-        hashOutput = hashtec.hashTEC(dataset)
-        siaResults.append(len(siaTecOutput))
-        hashResults.append(len(hashOutput))
+        score = Score.from_xml_file(filename)
+        datasets.append(sorted(set(score.to_siatec_score(1))))
+
+    siaResults = [0] * len(datasets)
+    for idx, siaTecOutput in siatec.siatec_many(datasets):
+        siaResults[idx] = len(siaTecOutput)
+    hashResults = [len(hashtec.hashTEC(dataset)) for dataset in datasets]
 
 
 def compDensityTest():
@@ -110,7 +107,7 @@ def compDensityTest():
 
 
 def main():
-    test1 = sorted(synth_tests.regular_dataset)
+    test1 = make_dataset(100, density=0.25, regularity=0.9, seed=0)
     syntheticDataTest(test1)
 
     # musicCompTest()
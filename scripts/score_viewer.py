@@ -1,8 +1,9 @@
 import argparse
 import logging
 
+from ostinato.cache import ResultCache
 from ostinato.music_elements import Score
-from ostinato.siatec import siatec
+from ostinato.siatec import siatec, siatec_iter
 
 
 def main(args):
@@ -15,16 +16,23 @@ def main(args):
     part_num = 1
     dataset = score.to_siatec_score(part_num)
     # print(dataset)
-    TECs = siatec(dataset)
     min_patt_size = 3
     min_num_patts = 1
+    limits = dict(
+        min_pattern_size=min_patt_size, min_translators=min_num_patts
+    )
+    if args.cache_dir is not None:
+        cache = ResultCache(args.cache_dir)
+        TECs = siatec(dataset, cache=cache, **limits)
+    else:
+        TECs = siatec_iter(dataset, **limits)
+    if args.stream:
+        for i, tec in enumerate(TECs):
+            print(f"TEC #{i+1}:\n{tec}\n")
+        return
+
     decent_TECs = sorted(
-        [
-            tec
-            for tec in TECs
-            if len(tec.pattern) >= min_patt_size
-            and len(tec.translators) >= min_num_patts
-        ],
+        TECs,
         key=lambda tec: (len(tec.pattern), len(tec.translators)),
         reverse=True,
     )
@@ -42,5 +50,14 @@ if __name__ == "__main__":
         "filepath",
         help="Path to a MusicXML file that ends either in .xml or .mxl",
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print TECs in discovery order as soon as they are found",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory where SIATEC results are cached between runs",
+    )
     args = parser.parse_args()
     main(args)
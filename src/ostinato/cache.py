@@ -0,0 +1,108 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from .results import TECSet, integral_columns
+
+# Default limit on the total size of the files kept by a ResultCache
+MAX_CACHE_BYTES = 2**30
+
+# Bumped whenever the stored format or the meaning of the results changes
+CACHE_VERSION = 4
+
+
+class ResultCache:
+    """Content addressed on-disk cache of SIATEC results.
+
+    Results are keyed by a hash of the dataset and of the options that
+    affect them and stored with ``TECSet.save``, so hits are memory mapped
+    instead of read. Every hit refreshes the modification time of its file,
+    so once the files exceed ``max_bytes`` the least recently used ones are
+    evicted first.
+
+    :param directory: directory holding the cached results, created when
+        missing
+    :param max_bytes: [int] largest total size of the cached files
+    """
+
+    suffix = ".tecs"
+
+    def __init__(self, directory, max_bytes=MAX_CACHE_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def key(self, D, options):
+        """Hash ``D`` and ``options`` into a stable hex digest.
+
+        Integer columns of ``D`` come back as integers from the cache, so
+        which columns hold only integers is part of the key as well.
+
+        :param options: [dict] the options that change the results
+        """
+        P = np.ascontiguousarray(np.asarray(D))
+        integral = integral_columns(D, P)
+        digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+        digest.update(f"{P.dtype.str}{P.shape}{integral}".encode())
+        digest.update(P.tobytes())
+        digest.update(repr(sorted(options.items())).encode())
+        return digest.hexdigest()
+
+    def path(self, key):
+        return self.directory / f"{key}{self.suffix}"
+
+    def get(self, key):
+        """Return the ``TECSet`` stored under ``key`` or ``None``."""
+        path = self.path(key)
+        try:
+            tec_set = TECSet.load(path)
+        except (FileNotFoundError, RuntimeError, ValueError, KeyError):
+            return None
+        os.utime(path)
+        return tec_set
+
+    def put(self, key, tec_set):
+        # Every writer has its own partial file, so concurrent runs on the
+        # same dataset never write into or move each other's file
+        handle, partial = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(handle)
+        try:
+            tec_set.save(partial)
+            # Readers never see a partially written result
+            os.replace(partial, self.path(key))
+        except BaseException:
+            Path(partial).unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def entries(self):
+        """Return ``(mtime, size, path)`` of every cached result."""
+        entries = list()
+        for path in self.directory.glob(f"*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    @property
+    def nbytes(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """Delete least recently used results until the cache fits."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            path.unlink(missing_ok=True)
@@ -0,0 +1,228 @@
+from dataclasses import dataclass, field
+from operator import add
+from typing import Dict, List, Tuple
+
+from .siatec import (
+    DataPoint,
+    PointIndex,
+    TranslationalEquivalenceClass,
+    compute_TEC_translators_indexed,
+    compute_vector_representations,
+    is_integral,
+    iter_TEC_set,
+    siatec,
+)
+
+
+# =============================================================================
+# ENCODINGS
+# =============================================================================
+def coverage(tec, index=None):
+    """Return the set of points covered by all occurrences of a TEC.
+
+    :param index: [PointIndex] of the dataset the TEC was found in. On
+        fractional coordinates ``p + t`` may round to a point other than the
+        one ``q`` with ``q - p == t``, so with an index every occurrence is
+        looked up instead, see ``occurrences``.
+    """
+    if index is not None:
+        return set(occurrences(tec, index).values())
+    return {
+        tuple(map(add, point, t))
+        for t in tec.translators
+        for point in tec.pattern
+    }
+
+
+def occurrences(tec, index):
+    """Map every pattern point ``p`` and translator ``t`` of a TEC to the
+    point ``q`` of ``index`` with ``q - p == t``."""
+    exact = is_integral(tec.pattern)
+    return {
+        (point, t): index.translate(point, t, exact)
+        for t in tec.translators
+        for point in tec.pattern
+    }
+
+
+def rounding_corrections(tec, index):
+    """Return the occurrences of a TEC that ``p + t`` rounds away from."""
+    return {
+        (point, t): q
+        for (point, t), q in occurrences(tec, index).items()
+        if tuple(map(add, point, t)) != q
+    }
+
+
+def encoding_size(tec):
+    # The zero vector is always a translator and is not stored
+    return len(tec.pattern) + len(tec.translators) - 1
+
+
+def compression_ratio(tec, index=None):
+    return len(coverage(tec, index)) / encoding_size(tec)
+
+
+@dataclass
+class Encoding:
+    """Compressed description of a point set.
+
+    :param tecs: TECs whose occurrences cover the encoded points
+    :param residual: points not covered by any TEC
+    :param num_points: number of distinct points in the original dataset
+    :param corrections: the points that pattern points ``p`` carried by
+        translators ``t`` stand for, keyed by ``(p, t)``, wherever ``p + t``
+        rounds to another point. Only fractional coordinates need them.
+    """
+
+    tecs: List[TranslationalEquivalenceClass]
+    residual: List[DataPoint]
+    num_points: int
+    corrections: Dict[Tuple[DataPoint, DataPoint], DataPoint] = field(
+        default_factory=dict
+    )
+
+    @property
+    def size(self):
+        stored = sum(map(encoding_size, self.tecs)) + len(self.residual)
+        return stored + len(self.corrections)
+
+    @property
+    def compression_ratio(self):
+        return self.num_points / self.size if self.size else 1.0
+
+    def points(self):
+        """Decode the encoding back into the sorted set of points."""
+        decoded = set(self.residual)
+        for tec in self.tecs:
+            decoded.update(
+                self.corrections.get((point, t), tuple(map(add, point, t)))
+                for t in tec.translators
+                for point in tec.pattern
+            )
+        return sorted(decoded)
+
+
+def best_TEC(TECs, index=None):
+    """Pick the TEC with the highest compression ratio.
+
+    Ties go to the larger coverage and then to the TEC found first.
+
+    :param index: [PointIndex] of the dataset, see ``coverage``
+    """
+    best, best_key = None, None
+    for tec in TECs:
+        covered = len(coverage(tec, index))
+        key = (covered / encoding_size(tec), covered)
+        if best_key is None or key > best_key:
+            best, best_key = tec, key
+    return best, best_key
+
+
+# =============================================================================
+# COSIATEC
+# =============================================================================
+def compute_vector_pairs(D):
+    V = list()
+    for i, start in enumerate(D):
+        for j in range(i + 1, len(D)):
+            diff = tuple([e - s for s, e in zip(start, D[j])])
+            V.append((diff, i, j))
+    return sorted(V)
+
+
+def iter_remaining_TECs(D, V, alive, cache):
+    """Yield the TECs of the points of ``D`` that are still ``alive``.
+
+    ``V`` must hold the pairs of live points only, in sorted order. The
+    translators of a pattern seen in an earlier round can only have lost
+    members since, so they are narrowed from ``cache`` instead of searched.
+    """
+    index = PointIndex.from_data([p for p, a in zip(D, alive) if a])
+
+    def find_translators(I):
+        key = tuple(I)
+        if key in cache:
+            pattern = [D[idx] for idx in I]
+            exact = is_integral(pattern)
+            cache[key] = [
+                t for t in cache[key] if index.covers(pattern, t, exact)
+            ]
+        else:
+            cache[key] = compute_TEC_translators_indexed(D, index, I)
+        return cache[key]
+
+    Y = compute_vector_representations(D, V, min_size=2)
+    T = iter_TEC_set(D, V, Y, find_translators)
+    return map(TranslationalEquivalenceClass.from_data, T)
+
+
+def cosiatec(D, incremental=True):
+    """Compress ``D`` with COSIATEC.
+
+    Every round keeps the best TEC of the points left and removes the points
+    it covers, until no TEC compresses the rest. The incremental mode keeps
+    the sorted vector table of the first round and drops the pairs of
+    covered points, instead of rerunning ``siatec`` on what is left.
+
+    :return: [Encoding] the chosen TECs and the uncovered points
+    """
+    D = sorted(set(D))
+    index = PointIndex.from_data(D)
+    lookup = {point: i for i, point in enumerate(D)}
+    alive = [True] * len(D)
+    V = compute_vector_pairs(D) if incremental else None
+    cache = dict()
+
+    tecs, corrections = list(), dict()
+    while any(alive):
+        if incremental:
+            V = [v for v in V if alive[v[1]] and alive[v[2]]]
+            pairs = [(v[0], v[1]) for v in V]
+            TECs = iter_remaining_TECs(D, pairs, alive, cache)
+        else:
+            TECs = siatec([p for p, a in zip(D, alive) if a])
+
+        tec, key = best_TEC(TECs, index)
+        if tec is None or key[0] <= 1:
+            break
+        tecs.append(tec)
+        corrections.update(rounding_corrections(tec, index))
+        for point in coverage(tec, index):
+            alive[lookup[point]] = False
+
+    residual = [p for p, a in zip(D, alive) if a]
+    return Encoding(tecs, residual, len(D), corrections)
+
+
+# =============================================================================
+# SIATECCompress
+# =============================================================================
+def siatec_compress(D, **options):
+    """Compress ``D`` with SIATECCompress.
+
+    TECs from a single ``siatec`` run are visited by decreasing compression
+    ratio and kept when they cover more new points than they cost to store.
+
+    :param options: passed on to ``siatec``
+    """
+    D = sorted(set(D))
+    index = PointIndex.from_data(D)
+    TECs = sorted(
+        siatec(D, **options),
+        key=lambda tec: compression_ratio(tec, index),
+        reverse=True,
+    )
+
+    tecs, covered, corrections = list(), set(), dict()
+    for tec in TECs:
+        new_points = coverage(tec, index) - covered
+        if len(new_points) > encoding_size(tec):
+            tecs.append(tec)
+            covered |= new_points
+            corrections.update(rounding_corrections(tec, index))
+        if len(covered) == len(D):
+            break
+
+    residual = [p for p in D if p not in covered]
+    return Encoding(tecs, residual, len(D), corrections)
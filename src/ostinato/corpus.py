@@ -0,0 +1,154 @@
+import pickle
+from operator import add, sub
+
+from .siatec import (
+    PointIndex,
+    compute_TEC_translators_indexed,
+    is_integral,
+)
+
+
+class CorpusIndex:
+    """Occurrence index over the point sets of many pieces.
+
+    Every piece keeps a hash of its points, and an inverted index maps each
+    difference vector to the pairs of points, in any piece, it joins. A
+    pattern is looked up through the pair of consecutive pattern points
+    whose vector is the rarest in the corpus: every posting of that vector
+    is a candidate translator, checked against the points of its piece, so
+    a query costs about O(|P| * candidates) instead of a SIATEC run per
+    piece.
+
+    Vectors between fractional coordinates do not add up exactly, so
+    pieces and patterns with coordinates that are not whole numbers are
+    never indexed and always scanned, see ``PointIndex``.
+
+    :param pieces: [Mapping | Iterable] point sets keyed by name, or a
+        sequence of point sets keyed by position
+    :param span: only index pairs of points at most this far apart in onset,
+        ``None`` indexes every pair. Patterns without a pair this close are
+        answered by scanning every piece.
+    """
+
+    def __init__(self, pieces=(), span=None):
+        self.span = span
+        self.pieces = dict()
+        self.postings = dict()
+        items = (
+            pieces.items() if hasattr(pieces, "items") else enumerate(pieces)
+        )
+        for name, points in items:
+            self.add(name, points)
+
+    def __len__(self):
+        return len(self.pieces)
+
+    def add(self, name, points):
+        if name in self.pieces:
+            raise RuntimeError(f"Piece {name} is already in the corpus index")
+        index = PointIndex.from_data(points)
+        self.pieces[name] = index
+        if not index.exact:
+            return
+
+        D = index.points
+        for i, start in enumerate(D):
+            for end in D[i + 1 :]:
+                if self.span is not None and end[0] - start[0] > self.span:
+                    break
+                vec = tuple(map(sub, end, start))
+                self.postings.setdefault(vec, list()).append((name, start))
+
+    def query(self, pattern):
+        """Find every occurrence of ``pattern`` in the corpus.
+
+        :return: [dict] sorted translators that carry the whole pattern into
+            a piece, keyed by the name of every piece it occurs in
+        """
+        P = sorted(set(map(tuple, pattern)))
+        if not P:
+            return dict()
+        anchor = self._rarest_pair(P) if is_integral(P) else None
+        if anchor is None:
+            return self._scan(P, self.pieces)
+
+        first, vec = anchor
+        found = dict()
+        for name, start in self.postings.get(vec, ()):
+            t = tuple(map(sub, start, first))
+            lookup = self.pieces[name].lookup
+            if all(tuple(map(add, p, t)) in lookup for p in P):
+                found.setdefault(name, list()).append(t)
+        found = {name: sorted(trans) for name, trans in found.items()}
+        inexact = [
+            name for name, index in self.pieces.items() if not index.exact
+        ]
+        found.update(self._scan(P, inexact))
+        return found
+
+    def query_many(self, patterns):
+        """Find the occurrences of many patterns.
+
+        Translationally equivalent patterns occur at the same places, so
+        each shape is only looked up once and its translators are shifted
+        to every pattern that has it.
+
+        :return: [list] the result of ``query`` for every pattern
+        """
+        results, seen = list(), dict()
+        exact = all(index.exact for index in self.pieces.values())
+        for pattern in patterns:
+            P = sorted(set(map(tuple, pattern)))
+            if not P:
+                results.append(dict())
+                continue
+            if not exact or not is_integral(P):
+                # Shifted translators are only exact on whole numbers
+                results.append(self.query(P))
+                continue
+            shape = tuple(tuple(map(sub, p, P[0])) for p in P)
+            if shape not in seen:
+                seen[shape] = (P[0], self.query(P))
+            origin, found = seen[shape]
+            shift = tuple(map(sub, origin, P[0]))
+            results.append(
+                {
+                    name: [tuple(map(add, t, shift)) for t in trans]
+                    for name, trans in found.items()
+                }
+            )
+        return results
+
+    def save(self, path):
+        with open(path, "wb") as outfile:
+            pickle.dump(self, outfile, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as infile:
+            index = pickle.load(infile)
+        if not isinstance(index, cls):
+            raise RuntimeError(f"{path} does not hold a corpus index")
+        return index
+
+    def _rarest_pair(self, P):
+        best = None
+        for start, end in zip(P, P[1:]):
+            if self.span is not None and end[0] - start[0] > self.span:
+                continue
+            vec = tuple(map(sub, end, start))
+            count = len(self.postings.get(vec, ()))
+            if best is None or count < best[0]:
+                best = (count, start, vec)
+        return None if best is None else best[1:]
+
+    def _scan(self, P, names):
+        found = dict()
+        I = list(range(len(P)))
+        for name in names:
+            index = self.pieces[name]
+            if index.points:
+                trans = compute_TEC_translators_indexed(P, index, I)
+                if trans:
+                    found[name] = trans
+        return found
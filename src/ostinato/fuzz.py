@@ -0,0 +1,244 @@
+import random
+from dataclasses import dataclass, field
+from typing import Callable, List
+
+from .incremental import SiatecSession
+from .siatec import DataPoint, as_point_set, siatec
+from .utils import compare_tec_sets
+
+# Grid step of the float coordinates, a power of two so that sums and
+# differences of coordinates stay exact
+FLOAT_STEP = 0.125
+
+# Kinds of coordinates, from the most to the least exact. Dyadic floats add
+# and subtract exactly, other fractions such as tenths round.
+EXACTNESS = ("integer", "dyadic", "fraction")
+
+
+# =============================================================================
+# GENERATORS
+# =============================================================================
+def dense_points(rng, size):
+    width = max(2, size // 6)
+    return [(rng.randrange(width), rng.randrange(6)) for _ in range(size)]
+
+
+def sparse_points(rng, size):
+    width = max(2, size * 20)
+    return [(rng.randrange(width), rng.randrange(88)) for _ in range(size)]
+
+
+def regular_points(rng, size):
+    motif = [(rng.randrange(6), rng.randrange(8)) for _ in range(4)]
+    points = list()
+    while len(points) < size:
+        dx, dy = rng.randrange(40), rng.randrange(-3, 4)
+        points.extend((x + dx, y + dy) for x, y in motif)
+        if rng.random() < 0.3:
+            points.append((rng.randrange(46), rng.randrange(-3, 12)))
+    return points[:size]
+
+
+def duplicate_points(rng, size):
+    unique = dense_points(rng, max(1, size // 2))
+    points = [rng.choice(unique) for _ in range(size)]
+    rng.shuffle(points)
+    return points
+
+
+def float_points(rng, size):
+    return [
+        (rng.randrange(size * 4) * FLOAT_STEP, rng.randrange(12) / 2)
+        for _ in range(size)
+    ]
+
+
+def fraction_points(rng, size):
+    return [
+        (rng.randrange(size) / 10, rng.randrange(6) / 3) for _ in range(size)
+    ]
+
+
+GENERATORS = {
+    "dense": dense_points,
+    "sparse": sparse_points,
+    "regular": regular_points,
+    "duplicates": duplicate_points,
+    "floats": float_points,
+    "fractions": fraction_points,
+}
+
+# Coordinates of every generator, see ``EXACTNESS``
+COORDINATES = {
+    "dense": "integer",
+    "sparse": "integer",
+    "regular": "integer",
+    "duplicates": "integer",
+    "floats": "dyadic",
+    "fractions": "fraction",
+}
+
+
+# =============================================================================
+# ENGINES UNDER TEST
+# =============================================================================
+@dataclass
+class Mode:
+    """A way of running SIATEC that must agree with the reference.
+
+    :param run: maps a dataset to a list of TECs
+    :param coordinates: [str] least exact coordinates, see ``EXACTNESS``,
+        on which the mode must find the TECs of the reference
+    """
+
+    run: Callable
+    coordinates: str = "fraction"
+
+    def accepts(self, kind):
+        """Whether the mode is checked on data of generator ``kind``."""
+        return EXACTNESS.index(COORDINATES[kind]) <= EXACTNESS.index(
+            self.coordinates
+        )
+
+
+def run_incremental(D):
+    return SiatecSession(as_point_set(D)).results()
+
+
+MODES = {
+    "numpy": Mode(lambda D: siatec(D, engine="numpy")),
+    "indexed": Mode(lambda D: siatec(D, engine="indexed")),
+    "packed": Mode(lambda D: siatec(D, engine="packed"), "integer"),
+    "hash": Mode(lambda D: siatec(D, engine="hash")),
+    # Quantizing and tolerance merge vectors that only differ by rounding
+    "quantized": Mode(
+        lambda D: siatec(D, engine="packed", resolution=FLOAT_STEP), "dyadic"
+    ),
+    "windowed": Mode(lambda D: siatec(D, window=len(D), window_by="index")),
+    "tolerant": Mode(lambda D: siatec(D, tolerance=FLOAT_STEP / 4), "dyadic"),
+    "compact": Mode(lambda D: list(siatec(D, compact=True))),
+    "incremental": Mode(run_incremental),
+    "parallel": Mode(lambda D: siatec(D, workers=2)),
+}
+
+
+def reference(D):
+    return siatec(D, engine="python")
+
+
+# =============================================================================
+# COMPARISON
+# =============================================================================
+def canonical(TECs):
+    """Reduce TECs to nested tuples that compare in one pass.
+
+    Engines must agree on the order of the TECs as well, so the order is
+    kept.
+    """
+    return tuple(
+        (tuple(map(tuple, tec.pattern)), tuple(map(tuple, tec.translators)))
+        for tec in TECs
+    )
+
+
+@dataclass
+class Failure:
+    """Dataset on which a mode disagrees with the reference.
+
+    :param mode: [str] name of the mode in ``MODES``
+    :param kind: [str] name of the generator in ``GENERATORS``
+    :param seed: [str] seed the dataset was generated from
+    :param points: the smallest failing dataset found by shrinking
+    :param reason: [str] exception raised by the mode or summary of how
+        its TECs differ, on the shrunk dataset
+    """
+
+    mode: str
+    kind: str
+    seed: str
+    points: List[DataPoint] = field(default_factory=list)
+    reason: str = ""
+
+    def __str__(self):
+        return (
+            f"{self.mode} on {self.kind} data (seed {self.seed!r}): "
+            f"{self.reason} for {self.points}"
+        )
+
+
+def disagrees(mode, D):
+    """Return how ``mode`` fails on ``D`` or ``None`` when it agrees with
+    the reference."""
+    try:
+        found = mode.run(D)
+    except Exception as err:
+        return f"{type(err).__name__}: {err}"
+    expected = reference(D)
+    if canonical(found) == canonical(expected):
+        return None
+    diff = compare_tec_sets(found, expected)
+    return str(diff) if not diff.equal else "same TECs in another order"
+
+
+def shrink(D, fails):
+    """Remove points from ``D`` for as long as ``fails`` holds.
+
+    Chunks of points are dropped, from halves of the dataset down to single
+    points, so that the dataset left is 1-minimal: removing any one of its
+    points makes the failure disappear.
+    """
+    D = list(D)
+    chunk = max(1, len(D) // 2)
+    while True:
+        start, removed = 0, False
+        while start < len(D):
+            candidate = D[:start] + D[start + chunk :]
+            if candidate and fails(candidate):
+                D, removed = candidate, True
+            else:
+                start += chunk
+        if chunk == 1 and not removed:
+            return D
+        if not removed:
+            chunk = max(1, chunk // 2)
+
+
+def fuzz(
+    num_cases=50,
+    seed=0,
+    kinds=tuple(GENERATORS),
+    modes=tuple(MODES),
+    max_size=30,
+    minimize=True,
+):
+    """Compare every mode with the reference on generated datasets.
+
+    :param num_cases: [int] datasets generated per kind
+    :param seed: seed of the whole run, every dataset is reproducible
+        from its own seed in the reported failures
+    :param kinds: [Iterable] names of the generators to draw from
+    :param modes: [Iterable] names of the modes to check
+    :param max_size: [int] largest dataset size
+    :param minimize: [bool] shrink failing datasets before reporting them
+    :return: [List] a ``Failure`` for every mode and dataset that disagree
+    """
+    failures = list()
+    for kind in kinds:
+        for case in range(num_cases):
+            case_seed = f"{seed}-{kind}-{case}"
+            rng = random.Random(case_seed)
+            D = GENERATORS[kind](rng, rng.randint(1, max_size))
+            for name in modes:
+                mode = MODES[name]
+                if not mode.accepts(kind):
+                    continue
+                if disagrees(mode, D) is None:
+                    continue
+                points = D
+                if minimize:
+                    points = shrink(
+                        D, lambda P: disagrees(mode, P) is not None
+                    )
+                reason = disagrees(mode, points)
+                failures.append(Failure(name, kind, case_seed, points, reason))
+    return failures
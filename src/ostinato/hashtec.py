@@ -1,40 +1,210 @@
-import src.ostinato.utils as util
+from operator import sub
 
+import numpy as np
 
-def compute_vector_table(D):
-    V = list()
-    for i, start in enumerate(D[:-1]):
-        for j, end in enumerate(D[i + 1 :]):
-            V.append((util.vectorSubtraction(start, end), i))
-    return V
+from .keys import PointCodec
+from .stats import NULL_STATS
 
 
-def mtpHashTable(D, V):
-    results = dict()
-    for vector, idx in V:
-        if vector in results:
-            results[vector].append(D[idx])
-        else:
-            results[vector] = [D[idx]]
+# =============================================================================
+# MTP TABLE
+# =============================================================================
+def compute_mtp_table(K):
+    """Hash the maximal translatable pattern of every repeated vector.
+
+    The pairs of the sorted keys ``K`` are grouped by difference in one
+    stable array sort, and the start keys of every group are sliced out of
+    a single list, so no Python level append runs per pair of points.
+    Vectors joining a single pair are left out: their pattern is one point
+    whose only translator is the zero vector.
+
+    :param K: [np.ndarray] sorted, distinct int64 point keys
+    :return: [dict] the sorted start keys of every repeated vector
+    """
+    i, j = np.triu_indices(len(K), 1)
+    diffs = K[j] - K[i]
+    # Pairs are in row order, so a stable sort keeps every group by start
+    order = np.argsort(diffs, kind="stable")
+    diffs, starts = diffs[order], K[i[order]]
+    del i, j, order
+
+    first = np.flatnonzero(np.diff(diffs, prepend=diffs[:1] - 1))
+    sizes = np.diff(first, append=len(diffs))
+    repeated = sizes > 1
+    starts = starts[np.repeat(repeated, sizes)].tolist()
+    first, sizes = first[repeated], sizes[repeated]
+    bounds = np.cumsum(sizes).tolist()
+    patterns = [starts[lo:hi] for lo, hi in zip([0] + bounds[:-1], bounds)]
+    return dict(zip(diffs[first].tolist(), patterns))
+
+
+def compute_mtp_table_points(D):
+    """Hash the maximal translatable pattern of every repeated vector of
+    the point tuples ``D``, see ``compute_mtp_table``."""
+    mtps = dict()
+    for i, start in enumerate(D):
+        for end in D[i + 1 :]:
+            mtps.setdefault(point_sub(end, start), list()).append(start)
+    return {vec: mtps[vec] for vec in sorted(mtps) if len(mtps[vec]) > 1}
+
+
+def point_sub(end, start):
+    return tuple(map(sub, end, start))
+
+
+def compute_vector_representations(mtps, min_size=2, diff=sub):
+    """Hash the patterns of ``mtps`` by their consecutive differences.
+
+    Patterns sharing the differences ``Q`` are translationally equivalent
+    and kept once. ``mtps`` is ordered by vector, so the pattern kept is
+    the one of the smallest vector, as in the ``siatec`` engines.
+
+    :param diff: [Callable] difference of two pattern points, ``point_sub``
+        for point tuples
+    :return: [List] ``(Q, pattern)`` ordered by ``(len(Q), Q)``
+    """
+    X = dict()
+    for pattern in mtps.values():
+        if len(pattern) >= min_size:
+            X.setdefault(tuple(map(diff, pattern[1:], pattern)), pattern)
+    return sorted(X.items(), key=lambda v_set: (len(v_set[0]), v_set[0]))
+
+
+# =============================================================================
+# TRANSLATORS
+# =============================================================================
+def compute_TEC_translators(mtps, lookup, Q, pattern, min_translators=1):
+    """Find the translators of ``pattern`` by hash lookups.
+
+    A translator carries every consecutive pair of pattern points onto a
+    pair of dataset points with the same difference, so the pattern of the
+    rarest difference in ``Q`` holds every candidate shift of its start.
+    The other pattern points keep the candidates that carry them onto a
+    dataset point.
+    """
+    rarest = min(Q, key=lambda vector: len(mtps.get(vector, ())))
+    if rarest not in mtps:
+        # Only the pattern itself has this difference
+        return [0] if min_translators <= 1 else list()
+    starts = mtps[rarest]
+    if len(starts) < min_translators:
+        return list()
+
+    j = Q.index(rarest)
+    anchor = pattern[j]
+    results = [start - anchor for start in starts]
+    for point in pattern[:j] + pattern[j + 2 :]:
+        results = [t for t in results if point + t in lookup]
+        if len(results) < min_translators:
+            return list()
     return results
 
 
-def equivClassHashTable(M):
-    results = dict()
+def search_counts(v_set, trans_set):
+    return dict(
+        translator_searches=1,
+        pattern_points=len(v_set[1]),
+        translators=len(trans_set),
+    )
+
+
+# =============================================================================
+# =============================================================================
+def iter_TECs(D, min_pattern_size=2, min_translators=1, stats=NULL_STATS):
+    """Run SIATEC on hash tables of maximal translatable patterns.
+
+    ``D`` must be sorted and free of duplicates. Integer coordinates that
+    fit in packed keys, see ``PointCodec``, are hashed as keys, any other
+    coordinates as point tuples. Single point patterns are never reported,
+    whatever ``min_pattern_size`` is.
+    """
+    if len(D) < 2:
+        return iter(())
+    codec = PointCodec.fit(D)
+    if codec is None:
+        return iter_TECs_points(D, min_pattern_size, min_translators, stats)
+
+    with stats.phase("vector_table"):
+        K = codec.encode(D)
+        mtps = compute_mtp_table(K)
+    stats.record(V=len(K) * (len(K) - 1) // 2)
+    with stats.phase("vector_representations"):
+        Y = compute_vector_representations(mtps, max(2, min_pattern_size))
+    stats.record(Y=len(Y))
+
+    K = K.tolist()
+    points = dict(zip(K, D))
+    return iter_TEC_set(points, codec, mtps, Y, min_translators, stats)
+
+
+def iter_TEC_set(points, codec, mtps, Y, min_translators=1, stats=NULL_STATS):
+    lookup = set(points)
+
+    def search(v_set):
+        Q, pattern = v_set
+        return compute_TEC_translators(
+            mtps, lookup, Q, pattern, min_translators
+        )
+
+    if stats is not NULL_STATS:
+        search = stats.instrument(search, search_counts)
+    for v_set in Y:
+        pattern = v_set[1]
+        trans_set = search(v_set)
+        if len(trans_set) >= min_translators:
+            yield (
+                [points[key] for key in pattern],
+                codec.decode_vectors(trans_set),
+            )
+
+
+def iter_TECs_points(
+    D, min_pattern_size=2, min_translators=1, stats=NULL_STATS
+):
+    """Run the hash engine on point tuples instead of packed keys.
+
+    Differences of fractional coordinates round, so two pairs of points
+    with the same difference do not always pin a translator. Translators
+    are searched as in the indexed engine instead, see ``PointIndex``.
+    """
+    from .siatec import PointIndex
+
+    with stats.phase("vector_table"):
+        mtps = compute_mtp_table_points(D)
+        index = PointIndex.from_data(D)
+    stats.record(V=len(D) * (len(D) - 1) // 2)
+    with stats.phase("vector_representations"):
+        Y = compute_vector_representations(
+            mtps, max(2, min_pattern_size), point_sub
+        )
+    stats.record(Y=len(Y))
+    return iter_TEC_set_points(index, Y, min_translators, stats)
+
+
+def iter_TEC_set_points(index, Y, min_translators=1, stats=NULL_STATS):
+    from .siatec import compute_TEC_translators_indexed
+
+    def search(v_set):
+        pattern = v_set[1]
+        return compute_TEC_translators_indexed(
+            pattern, index, range(len(pattern)), min_translators
+        )
 
-    for vector, points in M.items():
-        if len(points) > 1:
-            MaxVecShift = [(0, 0)]
-            for idx in range(1, len(points)):
-                diff = util.vectorSubtraction(points[idx - 1], points[idx])
-                MaxVecShift.append(util.vectorAddition(MaxVecShift[-1], diff))
-            results[tuple(MaxVecShift)] = 0
+    if stats is not NULL_STATS:
+        search = stats.instrument(search, search_counts)
+    for v_set in Y:
+        trans_set = search(v_set)
+        if len(trans_set) >= min_translators:
+            yield (v_set[1], trans_set)
 
-    return list(results.keys())
 
+def hashTEC(D, min_pattern_size=2, min_translators=1):
+    """Find the TECs of ``D`` with the hash engine, see ``iter_TECs``."""
+    from .siatec import siatec
 
-def hashTEC(D):
-    V = compute_vector_table(D)
-    mHash = mtpHashTable(D, V)
-    pTypes = equivClassHashTable(mHash)
-    return pTypes
+    return siatec(
+        D,
+        engine="hash",
+        min_pattern_size=min_pattern_size,
+        min_translators=min_translators,
+    )
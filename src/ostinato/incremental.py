@@ -0,0 +1,204 @@
+from operator import sub
+
+from .siatec import (
+    PointIndex,
+    TranslationalEquivalenceClass,
+    compute_TEC_translators_indexed,
+)
+
+
+class SiatecSession:
+    """SIATEC over a point set that grows as a performance is recorded.
+
+    Points must arrive in lexicographic order, each one later than every
+    point already in the session. The session keeps the start points of
+    every difference vector, groups vectors whose patterns share the same
+    shape ``Q`` and caches the translators of every shape. ``append`` only
+    visits the difference vectors that end on the new points:
+
+    - a vector that gains start points changes shape, so the shapes it
+      leaves and joins are the only ones whose pattern can change
+    - a new translator of an unchanged pattern moves its last point onto a
+      new point, so it is one of ``q - p_last`` for the new points ``q``
+    - a pattern that gained points is narrowed from the translators of the
+      pattern it grew from instead of searched from scratch
+
+    ``results`` matches ``siatec`` run from scratch on the same points.
+
+    :param points: initial points of the session
+    :param min_pattern_size: [int] smallest pattern to report
+    :param min_translators: [int] smallest number of translators to report
+    """
+
+    def __init__(self, points=(), min_pattern_size=2, min_translators=1):
+        self.min_pattern_size = max(2, min_pattern_size)
+        self.min_translators = min_translators
+        self.D = list()
+        self.index = PointIndex(list(), set())
+        self.starts = dict()
+        self.shapes = dict()
+        self.classes = dict()
+        self.tecs = dict()
+        self.new_vectors = dict()
+        self.append(points)
+
+    def __len__(self):
+        return len(self.D)
+
+    def append(self, points):
+        points = [tuple(p) for p in points]
+        chain = self.D[-1:] + points
+        for prev, point in zip(chain, chain[1:]):
+            if not prev < point:
+                raise RuntimeError(
+                    f"Point {point} does not come after {prev} in the session"
+                )
+
+        old_size = len(self.D)
+        self.D.extend(points)
+        self.index.extend(points)
+        self.new_vectors.clear()
+
+        touched = dict()
+        for j in range(old_size, len(self.D)):
+            end = self.D[j]
+            for i in range(j):
+                vec = tuple(map(sub, end, self.D[i]))
+                starts = self.starts.setdefault(vec, list())
+                touched.setdefault(vec, len(starts))
+                starts.append(i)
+
+        # Translator lists are extended in place, so remember their lengths
+        old_tecs = {Q: (rep, T, len(T)) for Q, (rep, T) in self.tecs.items()}
+        old_shapes = dict()
+        changed = set()
+        for vec, num_old in touched.items():
+            old_shapes[vec] = self.shapes.get(vec)
+            changed.add(old_shapes[vec])
+            changed.add(self._reshape(vec, num_old))
+        changed.discard(None)
+
+        for Q in self.tecs.keys() - changed:
+            self._extend_translators(Q, old_size)
+        for Q in changed:
+            if Q not in self.classes:
+                self.tecs.pop(Q, None)
+                continue
+            rep = min(self.classes[Q])
+            if Q in old_tecs and old_tecs[Q][0] == rep:
+                self._extend_translators(Q, old_size)
+            elif old_shapes.get(rep) in old_tecs:
+                old_rep, T, num_trans = old_tecs[old_shapes[rep]]
+                self.tecs[Q] = (
+                    rep,
+                    self._narrow_translators(
+                        rep, touched[rep], old_rep, T[:num_trans], old_size
+                    ),
+                )
+            else:
+                self.tecs[Q] = (rep, self._translators(rep))
+
+    def results(self):
+        """Return the TECs of all points so far, in ``siatec`` order."""
+        TECs = list()
+        for Q in sorted(self.tecs, key=lambda Q: (len(Q), Q)):
+            rep, trans_set = self.tecs[Q]
+            if len(trans_set) >= self.min_translators:
+                patt_set = [self.D[i] for i in self.starts[rep]]
+                TECs.append(TranslationalEquivalenceClass(patt_set, trans_set))
+        return TECs
+
+    def _reshape(self, vec, num_old):
+        """Move a vector that gained start points to its new shape class."""
+        starts = self.starts[vec]
+        old_Q = self.shapes.get(vec)
+        if old_Q is not None:
+            self.classes[old_Q].discard(vec)
+            if not self.classes[old_Q]:
+                del self.classes[old_Q]
+
+        if len(starts) < self.min_pattern_size:
+            return None
+        if old_Q is None:
+            old_Q, num_old = tuple(), 1
+        points = [self.D[i] for i in starts[num_old - 1 :]]
+        diffs = [tuple(map(sub, e, s)) for s, e in zip(points, points[1:])]
+        Q = old_Q + tuple(diffs)
+        self.shapes[vec] = Q
+        self.classes.setdefault(Q, set()).add(vec)
+        return Q
+
+    def _translators(self, vec):
+        I = self.starts[vec]
+        return compute_TEC_translators_indexed(self.D, self.index, I)
+
+    def _narrow_translators(self, vec, num_old, old_rep, T, old_size):
+        """Find the translators of a pattern that gained points.
+
+        Every translator of the grown pattern also translates the points it
+        had before. Those were a translate of the pattern of ``old_rep``, so
+        the candidates are its translators ``T`` shifted to match, plus the
+        translators that move a pattern point onto a new point.
+        Shifting translators is only exact on whole number coordinates, so
+        other patterns are searched from scratch unless they grew from the
+        pattern of ``vec`` itself, see ``PointIndex``.
+        """
+        if not self.index.exact and old_rep != vec:
+            return self._translators(vec)
+        starts = self.starts[vec]
+        pattern = [self.D[i] for i in starts]
+        shift = tuple(map(sub, pattern[0], self.D[self.starts[old_rep][0]]))
+        last = pattern[num_old - 1]
+
+        # Shifted translators already hold on the points the pattern had
+        grown = pattern[num_old:]
+        trans_set = [
+            t
+            for t in (tuple(map(sub, t, shift)) for t in T)
+            if self.index.covers(grown, t)
+        ]
+        return self._add_translators(pattern, last, trans_set, old_size)
+
+    def _extend_translators(self, Q, old_size):
+        rep, trans_set = self.tecs[Q]
+        pattern = [self.D[i] for i in self.starts[rep]]
+        self.tecs[Q] = (
+            rep,
+            self._add_translators(pattern, pattern[-1], trans_set, old_size),
+        )
+
+    def _add_translators(self, pattern, last, trans_set, old_size):
+        """Add the translators that carry ``pattern`` onto a new point.
+
+        Every other translator of ``pattern`` is already in ``trans_set``.
+        On whole number coordinates the new point is the image of ``last``,
+        so ``trans_set`` is extended in place. Otherwise the candidates are
+        ``q - p`` for every pattern point ``p`` and new point ``q``, matched
+        as in ``PointIndex.covers``, and a new sorted list is returned.
+        """
+        new_points = self.D[old_size:]
+        if self.index.exact:
+            for q in new_points:
+                t = tuple(map(sub, q, last))
+                if self.index.covers(pattern, t):
+                    trans_set.append(t)
+            return trans_set
+
+        known = set(trans_set)
+        candidates = set().union(
+            *(self._vectors_to(p, new_points) for p in pattern)
+        )
+        candidates -= known
+        for p in pattern:
+            if not candidates:
+                break
+            candidates &= self.index.vectors_from(p).keys()
+        return sorted(known | candidates)
+
+    def _vectors_to(self, start, new_points):
+        """Return the vectors from ``start`` to the points just appended."""
+        vectors = self.new_vectors.get(start)
+        if vectors is None:
+            vectors = {tuple(map(sub, q, start)) for q in new_points}
+            self.new_vectors[start] = vectors
+        return vectors
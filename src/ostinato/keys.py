@@ -0,0 +1,114 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+# Largest magnitude a packed key or key difference may reach
+KEY_LIMIT = 2**62
+
+
+@dataclass
+class PointCodec:
+    """Linear map between points and fixed width integer keys.
+
+    Coordinates are quantized to integer steps of ``resolution`` and packed
+    in a balanced mixed radix, so that for any points ``p`` and ``q``
+
+        encode(q) - encode(p) == encode_vector(q - p)
+
+    and integer order matches lexicographic order, for points as well as
+    for difference vectors. Vector tables can then be built, sorted and
+    hashed with plain integers and only decoded at the boundary.
+
+    :param lower: smallest quantized coordinate of every dimension
+    :param spans: largest minus smallest quantized coordinate per dimension
+    :param strides: radix weight of every dimension
+    :param resolution: grid step of every dimension, ``None`` when the
+        coordinates are integers and encoded losslessly
+    """
+
+    lower: Tuple[int, ...]
+    spans: Tuple[int, ...]
+    strides: Tuple[int, ...]
+    resolution: Optional[Tuple[float, ...]] = None
+
+    @classmethod
+    def fit(cls, D, resolution=None) -> Optional[PointCodec]:
+        """Build a codec for ``D`` or return ``None`` if none fits.
+
+        Without a ``resolution`` only integer coordinates are accepted, so
+        the encoding is exact. Either way the keys must fit in an int64.
+
+        :param resolution: [float | Sequence] grid step, for all dimensions
+            or one per dimension
+        """
+        P = np.asarray(D)
+        if P.size == 0:
+            return None
+        P = P.reshape(len(P), -1)
+        if resolution is not None:
+            resolution = _per_dimension(resolution, P.shape[1])
+            P = quantize(P, resolution)
+        elif not np.all(np.mod(P, 1) == 0):
+            return None
+
+        lower = P.min(axis=0)
+        spans = P.max(axis=0) - lower
+        if np.any(np.abs(lower) >= KEY_LIMIT):
+            return None
+
+        # Every stride is larger than twice the largest weighted difference
+        # of the dimensions after it, which keeps vector keys unambiguous
+        strides, stride = list(), 1
+        for span in reversed(spans.tolist()):
+            strides.append(stride)
+            stride *= 2 * int(span) + 1
+            if stride >= KEY_LIMIT:
+                return None
+        return cls(
+            tuple(lower.astype(np.int64).tolist()),
+            tuple(spans.astype(np.int64).tolist()),
+            tuple(reversed(strides)),
+            resolution,
+        )
+
+    def encode(self, D) -> np.ndarray:
+        """Encode the points of ``D`` as int64 keys."""
+        P = np.asarray(D).reshape(len(D), -1)
+        if self.resolution is not None:
+            P = quantize(P, self.resolution)
+        P = P.astype(np.int64) - np.array(self.lower, dtype=np.int64)
+        return P @ np.array(self.strides, dtype=np.int64)
+
+    def encode_vector(self, vector) -> int:
+        if self.resolution is not None:
+            vector = quantize(np.asarray(vector), self.resolution).tolist()
+        return sum(int(v) * s for v, s in zip(vector, self.strides))
+
+    def decode_vectors(self, keys) -> list:
+        """Decode difference vector keys back into vector tuples."""
+        rest = np.asarray(keys, dtype=np.int64)
+        columns = list()
+        for stride in self.strides:
+            digit = (rest + (stride - 1) // 2) // stride
+            rest = rest - digit * stride
+            columns.append(digit)
+        vecs = np.stack(columns, axis=-1)
+        if self.resolution is not None:
+            vecs = vecs * np.array(self.resolution)
+        return [tuple(v) for v in vecs.tolist()]
+
+
+def quantize(P, resolution):
+    return np.rint(P / np.array(resolution)).astype(np.int64)
+
+
+def _per_dimension(resolution, num_dims):
+    if isinstance(resolution, Sequence):
+        if len(resolution) != num_dims:
+            raise RuntimeError(
+                f"Expected {num_dims} resolutions, got {len(resolution)}"
+            )
+        return tuple(float(r) for r in resolution)
+    return (float(resolution),) * num_dims
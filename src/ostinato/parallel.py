@@ -0,0 +1,147 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from . import vectorized
+from .stats import NULL_STATS
+
+# Number of Y ranges handed to each worker, more ranges smooth out uneven
+# translator searches at the cost of more task round trips
+CHUNKS_PER_WORKER = 4
+
+# Vector table and Y attached by a worker process
+_WORKER = dict()
+
+
+# =============================================================================
+# SHARED MEMORY
+# =============================================================================
+def share_arrays(arrays):
+    """Copy arrays into new shared memory blocks.
+
+    :return: [Tuple] the blocks, which the caller must close and unlink, and
+        a picklable spec that ``attach_arrays`` turns back into arrays
+    """
+    blocks, spec = list(), dict()
+    for name, arr in arrays.items():
+        shm = SharedMemory(create=True, size=max(arr.nbytes, 1))
+        np.ndarray(arr.shape, arr.dtype, buffer=shm.buf)[...] = arr
+        blocks.append(shm)
+        spec[name] = (shm.name, arr.shape, arr.dtype.str)
+    return blocks, spec
+
+
+def attach_arrays(spec):
+    """Map the blocks named in ``spec`` without copying them.
+
+    :return: [Tuple] the blocks, which must outlive the arrays, and the
+        arrays keyed by name
+    """
+    blocks, arrays = list(), dict()
+    for name, (shm_name, shape, dtype) in spec.items():
+        shm = SharedMemory(name=shm_name)
+        blocks.append(shm)
+        arrays[name] = np.ndarray(shape, dtype, buffer=shm.buf)
+    return blocks, arrays
+
+
+def release_arrays(blocks):
+    for shm in blocks:
+        shm.close()
+        shm.unlink()
+
+
+# =============================================================================
+# WORKERS
+# =============================================================================
+def _init_worker(spec, radix, min_translators):
+    blocks, arr = attach_arrays(spec)
+    _WORKER["blocks"] = blocks
+    _WORKER["table"] = vectorized.VectorTable(
+        arr["points"], arr["order"], None, arr["W"], None, arr["starts"], radix
+    )
+    _WORKER["flat"] = arr["flat"]
+    _WORKER["Y"] = (arr["offsets"], arr["sizes"])
+    _WORKER["min_translators"] = min_translators
+
+
+def _translator_task(lo, hi):
+    offsets, sizes = _WORKER["Y"]
+    Y = (offsets[lo:hi], sizes[lo:hi])
+    return list(
+        vectorized.iter_translator_sets(
+            _WORKER["table"], Y, _WORKER["flat"], _WORKER["min_translators"]
+        )
+    )
+
+
+def split_work(sizes, num_chunks):
+    """Cut Y into contiguous ranges holding about the same amount of work.
+
+    The batched translator search costs about one row of ``W`` per pattern
+    point, so the work of a vector set is estimated by its size.
+    """
+    work = np.cumsum(sizes)
+    if len(work) == 0:
+        return list()
+    targets = work[-1] * np.arange(1, num_chunks) / num_chunks
+    cuts = np.searchsorted(work, targets, side="right").tolist()
+    bounds = sorted(set([0] + cuts + [len(sizes)]))
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+# =============================================================================
+
+
+def iter_TECs(
+    D, workers, min_pattern_size=1, min_translators=1, stats=NULL_STATS
+):
+    """Run the numpy engine with translator searches spread over a pool.
+
+    The dataset, vector table and Y are placed in shared memory once and
+    every worker handles disjoint ranges of Y. Results are merged in the
+    order of Y, so the output matches a serial run.
+    """
+    if len(D) < 2:
+        return
+    with stats.phase("vector_table"):
+        table = vectorized.compute_vector_table(D)
+    stats.record(V=len(table.V), W=table.W.size)
+    with stats.phase("vector_representations"):
+        offsets, sizes = vectorized.compute_vector_representations(
+            table, min_pattern_size
+        )
+    stats.record(Y=len(offsets))
+    blocks, spec = share_arrays(
+        {
+            "points": table.points,
+            "order": table.order,
+            "W": table.W,
+            "flat": table.flat_rows(),
+            "starts": table.starts,
+            "offsets": offsets,
+            "sizes": sizes,
+        }
+    )
+    try:
+        ranges = split_work(sizes, workers * CHUNKS_PER_WORKER)
+        with ProcessPoolExecutor(
+            workers,
+            initializer=_init_worker,
+            initargs=(spec, table.radix, min_translators),
+        ) as pool:
+            results = pool.map(_translator_task, *zip(*ranges))
+            while True:
+                # Workers search in parallel, so this is the time spent
+                # waiting for their results
+                with stats.phase("translators"):
+                    result = next(results, None)
+                if result is None:
+                    break
+                stats.count(translator_searches=len(result))
+                for I, trans_set in result:
+                    if len(trans_set) >= min_translators:
+                        yield ([D[index] for index in I], trans_set)
+    finally:
+        release_arrays(blocks)
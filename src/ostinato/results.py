@@ -0,0 +1,369 @@
+import json
+from operator import index as as_index
+
+import numpy as np
+
+# Number of points gathered in Python lists before they are moved into an
+# array chunk while a TECSet is built
+CHUNK_POINTS = 2**16
+
+# First bytes of a saved TECSet, the last two count the format version
+MAGIC = b"OSTTEC01"
+
+# Arrays of a saved TECSet start on multiples of this many bytes
+ALIGNMENT = 64
+
+ARRAY_NAMES = (
+    "patterns",
+    "pattern_offsets",
+    "translators",
+    "translator_offsets",
+)
+
+
+class TECView:
+    """Lightweight handle on one TEC stored in a ``TECSet``.
+
+    Behaves like a ``TranslationalEquivalenceClass``, but only expands its
+    pattern and translators into lists of tuples when they are accessed.
+    """
+
+    __slots__ = ("tec_set", "index")
+
+    def __init__(self, tec_set, index):
+        self.tec_set = tec_set
+        self.index = index
+
+    @property
+    def pattern_array(self):
+        return self.tec_set.pattern_array(self.index)
+
+    @property
+    def translator_array(self):
+        return self.tec_set.translator_array(self.index)
+
+    @property
+    def pattern(self):
+        return to_points(self.pattern_array, self.tec_set.pattern_columns)
+
+    @property
+    def translators(self):
+        return to_points(
+            self.translator_array, self.tec_set.translator_columns
+        )
+
+    def __eq__(self, other):
+        if not hasattr(other, "pattern") or not hasattr(other, "translators"):
+            return NotImplemented
+        return (
+            self.pattern == other.pattern
+            and self.translators == other.translators
+        )
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __str__(self):
+        patts = "; ".join([str(d) for d in self.pattern])
+        trans = "; ".join([str(t) for t in self.translators])
+        return f"PATTERN: {patts}\nTRANSLATORS: {trans}"
+
+
+class TECSet:
+    """Compact container for the TECs of a SIATEC run.
+
+    All patterns share one flat coordinate array and all translators
+    another. Offset arrays mark where every TEC starts, so TEC ``i`` owns
+    ``patterns[pattern_offsets[i]:pattern_offsets[i + 1]]``. Integer data
+    is kept in the narrowest integer type that holds it, so cast the arrays
+    before doing arithmetic on them.
+
+    Points mixing integer and float coordinates, such as ``(0, 60.5)``, are
+    stored as floats. The dtype of every column is kept, so expanded TECs
+    hold the same integers as the TECs the set was built from. Columns that
+    hold both integers and floats come back as floats.
+
+    :param patterns: (N, k) coordinates of every pattern point
+    :param pattern_offsets: (T + 1,) start of every pattern in ``patterns``
+    :param translators: (M, k) coordinates of every translator
+    :param translator_offsets: (T + 1,) start of every translator set
+    :param pattern_columns: [Tuple] dtype of every column of ``patterns``,
+        ``None`` when they all have the dtype of the array
+    :param translator_columns: [Tuple] same for ``translators``
+    """
+
+    def __init__(
+        self,
+        patterns,
+        pattern_offsets,
+        translators,
+        translator_offsets,
+        pattern_columns=None,
+        translator_columns=None,
+    ):
+        self.patterns = patterns
+        self.pattern_offsets = pattern_offsets
+        self.translators = translators
+        self.translator_offsets = translator_offsets
+        self.pattern_columns = pattern_columns
+        self.translator_columns = translator_columns
+
+    def __len__(self):
+        return len(self.pattern_offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.select(index)
+        try:
+            index = as_index(index)
+        except TypeError:
+            raise TypeError(
+                "TECSet indices must be integers or slices, "
+                f"not {type(index).__name__}"
+            ) from None
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TECSet index out of range")
+        return TECView(self, index)
+
+    def __iter__(self):
+        return (TECView(self, i) for i in range(len(self)))
+
+    def __eq__(self, other):
+        return len(self) == len(other) and all(
+            a == b for a, b in zip(self, other)
+        )
+
+    def pattern_array(self, index):
+        lo, hi = self.pattern_offsets[index : index + 2]
+        return self.patterns[lo:hi]
+
+    def translator_array(self, index):
+        lo, hi = self.translator_offsets[index : index + 2]
+        return self.translators[lo:hi]
+
+    def pattern_sizes(self):
+        return np.diff(self.pattern_offsets)
+
+    def translator_counts(self):
+        return np.diff(self.translator_offsets)
+
+    @property
+    def nbytes(self):
+        return sum(
+            arr.nbytes
+            for arr in (
+                self.patterns,
+                self.pattern_offsets,
+                self.translators,
+                self.translator_offsets,
+            )
+        )
+
+    def select(self, indices):
+        """Gather the TECs at ``indices`` into a new ``TECSet``.
+
+        Works on the flat arrays only, so a memory mapped set can be
+        filtered by ``pattern_sizes`` or ``translator_counts`` without
+        expanding any TEC.
+
+        :param indices: integer indices, a slice or a boolean mask over the
+            TECs
+        """
+        indices = np.arange(len(self))[indices]
+        patterns, pattern_offsets = _gather(
+            self.patterns, self.pattern_offsets, indices
+        )
+        translators, translator_offsets = _gather(
+            self.translators, self.translator_offsets, indices
+        )
+        return TECSet(
+            patterns,
+            pattern_offsets,
+            translators,
+            translator_offsets,
+            self.pattern_columns,
+            self.translator_columns,
+        )
+
+    def save(self, path):
+        """Write the flat arrays to ``path`` in a memory mappable layout.
+
+        The file holds ``MAGIC``, the length of a JSON header, the header
+        with the dtype, shape and byte offset of every array and the dtypes
+        of the point columns, and then the raw arrays aligned to
+        ``ALIGNMENT`` bytes.
+        """
+        arrays = [np.ascontiguousarray(getattr(self, n)) for n in ARRAY_NAMES]
+        specs, offset = dict(), 0
+        for name, arr in zip(ARRAY_NAMES, arrays):
+            specs[name] = dict(
+                dtype=arr.dtype.str, shape=arr.shape, offset=offset
+            )
+            offset = _aligned(offset + arr.nbytes)
+        specs["patterns"]["columns"] = self.pattern_columns
+        specs["translators"]["columns"] = self.translator_columns
+
+        header = json.dumps(specs).encode()
+        start = _aligned(len(MAGIC) + 8 + len(header))
+        with open(path, "wb") as outfile:
+            outfile.write(MAGIC)
+            outfile.write(len(header).to_bytes(8, "little"))
+            outfile.write(header)
+            for name, arr in zip(ARRAY_NAMES, arrays):
+                outfile.seek(start + specs[name]["offset"])
+                outfile.write(arr.tobytes())
+            outfile.truncate(start + offset)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Read a set written by ``save``.
+
+        :param mmap: [bool] map the arrays read only instead of reading
+            them, so only the parts that are accessed are loaded
+        """
+        with open(path, "rb") as infile:
+            if infile.read(len(MAGIC)) != MAGIC:
+                raise RuntimeError(f"{path} does not hold a saved TECSet")
+            size = int.from_bytes(infile.read(8), "little")
+            specs = json.loads(infile.read(size))
+        start = _aligned(len(MAGIC) + 8 + size)
+
+        arrays = list()
+        for name in ARRAY_NAMES:
+            dtype = np.dtype(specs[name]["dtype"])
+            shape = tuple(specs[name]["shape"])
+            offset = start + specs[name]["offset"]
+            if np.prod(shape) == 0:
+                arrays.append(np.empty(shape, dtype))
+            elif mmap:
+                arrays.append(np.memmap(path, dtype, "r", offset, shape))
+            else:
+                count = int(np.prod(shape))
+                arr = np.fromfile(path, dtype, count, offset=offset)
+                arrays.append(arr.reshape(shape))
+        return cls(
+            *arrays,
+            _columns(specs["patterns"].get("columns")),
+            _columns(specs["translators"].get("columns")),
+        )
+
+    @classmethod
+    def from_TECs(cls, TECs, chunk_points=CHUNK_POINTS):
+        """Pack an iterable of TECs, consuming it chunk by chunk."""
+        patterns = _ChunkedPoints(chunk_points)
+        translators = _ChunkedPoints(chunk_points)
+        pattern_offsets, translator_offsets = [0], [0]
+        for tec in TECs:
+            patterns.extend(tec.pattern)
+            translators.extend(tec.translators)
+            pattern_offsets.append(patterns.size)
+            translator_offsets.append(translators.size)
+
+        return cls(
+            patterns.to_array(),
+            narrow(np.array(pattern_offsets, dtype=np.int64)),
+            translators.to_array(),
+            narrow(np.array(translator_offsets, dtype=np.int64)),
+            patterns.columns(),
+            translators.columns(),
+        )
+
+
+def narrow(arr):
+    """Store integer data in the smallest integer type that holds it."""
+    if arr.dtype.kind != "i" or arr.size == 0:
+        return arr
+    lo, hi = arr.min(), arr.max()
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return arr.astype(dtype)
+    return arr
+
+
+def integral_columns(points, arr):
+    """Return whether every coordinate in each column of ``points`` is an
+    integer, where ``arr`` holds ``points`` as an array."""
+    if arr.dtype.kind != "f":
+        return [True] * arr.shape[1]
+    return [
+        all(isinstance(x, (int, np.integer)) for x in column)
+        for column in zip(*points)
+    ]
+
+
+def to_points(arr, columns=None):
+    """Turn the rows of ``arr`` into tuples, casting every column to its
+    dtype in ``columns``."""
+    if columns is None:
+        return [tuple(p) for p in arr.tolist()]
+    return list(
+        zip(
+            *[
+                arr[:, c].astype(dtype).tolist()
+                for c, dtype in enumerate(columns)
+            ]
+        )
+    )
+
+
+def _columns(columns):
+    return None if columns is None else tuple(columns)
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _gather(flat, offsets, indices):
+    offsets = offsets.astype(np.int64)
+    sizes = np.diff(offsets)[indices]
+    new_offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=new_offsets[1:])
+    rows = np.repeat(offsets[indices] - new_offsets[:-1], sizes)
+    rows += np.arange(new_offsets[-1])
+    return flat[rows], narrow(new_offsets)
+
+
+class _ChunkedPoints:
+    def __init__(self, chunk_points):
+        self.chunk_points = chunk_points
+        self.chunks = list()
+        self.pending = list()
+        self.size = 0
+        # Whether every coordinate seen so far in each column is an integer
+        self.integral = None
+
+    def extend(self, points):
+        self.pending.extend(points)
+        self.size += len(points)
+        if len(self.pending) >= self.chunk_points:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        chunk = narrow(np.array(self.pending))
+        integral = integral_columns(self.pending, chunk)
+        if self.integral is not None:
+            integral = list(map(min, integral, self.integral))
+        self.integral = integral
+        self.chunks.append(chunk)
+        self.pending = list()
+
+    def to_array(self):
+        self.flush()
+        if not self.chunks:
+            return np.empty((0, 0), dtype=np.int64)
+        return np.concatenate(self.chunks)
+
+    def columns(self):
+        """Return the dtype of every column, or ``None`` when they all have
+        the dtype of ``to_array``."""
+        arr = self.to_array()
+        if arr.dtype.kind != "f" or not any(self.integral):
+            return None
+        integer = np.dtype(np.int64).str
+        return tuple(integer if i else arr.dtype.str for i in self.integral)
@@ -1,5 +1,24 @@
-from dataclasses import dataclass
-from typing import List, Tuple
+from dataclasses import dataclass, field
+from bisect import bisect_right
+from functools import partial
+from itertools import product
+from math import floor
+from multiprocessing import Pool
+from operator import add, sub
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+from . import hashtec, parallel, vectorized
+from .keys import PointCodec
+from .results import TECSet
+from .stats import NULL_STATS, SiatecStats
+
+DataPoint = Tuple[int, float]
+
+# Whole numbers up to this magnitude add and subtract exactly as floats
+MAX_EXACT = 2**52
+
 
 # =============================================================================
 # CORE SIATEC
@@ -19,46 +38,69 @@ def compute_vector_table(D):
     return sorted(V), W
 
 
-def compute_vector_representations(D, V):
-    X, i = list(), 0
+def compute_vector_representations(D, V, min_size=1):
+    X, i = dict(), 0
     num_vectors = len(V)
     while i < num_vectors:
-        Q = list()
         j = i + 1
         while j < num_vectors and V[j][0] == V[i][0]:
-            strt_pt = D[V[j - 1][1]]
-            end_pt = D[V[j][1]]
-            diff = tuple([e - s for s, e in zip(strt_pt, end_pt)])
-            Q.append(diff)
             j += 1
-        X.append((i, Q))
+        # Vector sets that are too small never reach the translator search
+        if j - i >= min_size:
+            Q = list()
+            for k in range(i + 1, j):
+                strt_pt = D[V[k - 1][1]]
+                end_pt = D[V[k][1]]
+                diff = tuple([e - s for s, e in zip(strt_pt, end_pt)])
+                Q.append(diff)
+            X.setdefault(tuple(Q), i)
         i = j
 
-    return sorted(X, key=lambda v_set: (len(v_set[1]), v_set[1], v_set[0]))
+    return sort_vector_sets(X)
 
 
-def compute_TEC_set(D, V, W, Y):
-    T, i = list(), 0
-    num_vector_sets = len(Y)
-    num_vectors = len(V)
+def sort_vector_sets(X):
+    """Order distinct vector sets by ``(len(Q), Q, i)``.
+
+    ``X`` maps every vector set ``Q`` to the first ``V`` position it was seen
+    at. Translationally equivalent patterns share the same ``Q``, so the
+    dictionary hashes duplicates together in linear time and only the
+    distinct sets are compared by the sort.
+    """
+    Y = [(i, Q) for Q, i in X.items()]
+    return sorted(Y, key=lambda v_set: (len(v_set[1]), v_set[1]))
+
+
+def compute_TEC_set(D, V, W, Y, find_translators=None):
+    if find_translators is None:
+        find_translators = partial(compute_TEC_translators, D, W)
+    return list(iter_TEC_set(D, V, Y, find_translators))
+
 
-    while i < num_vector_sets:
-        j = Y[i][0]
+def iter_TEC_set(
+    D, V, Y, find_translators, min_translators=1, stats=NULL_STATS
+):
+    if stats is not NULL_STATS:
+        find_translators = stats.instrument(find_translators, search_counts)
+    num_vectors = len(V)
+    for i, _ in Y:
+        j = i
         I = list()
-        while j < num_vectors and V[j][0] == V[Y[i][0]][0]:
+        while j < num_vectors and V[j][0] == V[i][0]:
             I.append(V[j][1])
             j += 1
         patt_set = [D[index] for index in I]
-        trans_set = compute_TEC_translators(D, W, I)
-        if trans_set:
-            T.append((patt_set, trans_set))
+        trans_set = find_translators(I)
+        if len(trans_set) >= min_translators:
+            yield (patt_set, trans_set)
 
-        while True:
-            i += 1
-            if i >= num_vector_sets or Y[i][1] != Y[i - 1][1]:
-                break
 
-    return T
+def search_counts(I, trans_set):
+    return dict(
+        translator_searches=1,
+        pattern_points=len(I),
+        translators=len(trans_set),
+    )
 
 
 def compute_TEC_translators(D, W, I):
@@ -105,20 +147,735 @@ def compute_TEC_translators(D, W, I):
 # =============================================================================
 
 
+# =============================================================================
+# INDEXED TRANSLATORS
+# =============================================================================
+@dataclass
+class PointIndex:
+    """Hash index over the distinct points of a dataset.
+
+    Lets translators be found without the O(n^2) ``W`` table: a candidate
+    shift ``q - p0`` is a translator when every shifted pattern point is
+    found in ``lookup``.
+
+    That only holds when coordinates add exactly. Otherwise ``p + (q - p)``
+    may round to a point other than ``q``, so translators are matched as
+    the ``W`` table engines match them, against the vectors ``q - p`` from
+    every pattern point ``p``. Those are computed once per point and kept
+    in ``vectors``, along with the point ``q`` each of them leads to.
+
+    :param exact: [bool] whether every coordinate is a whole number, see
+        ``is_integral``
+    """
+
+    points: List[DataPoint]
+    lookup: Set[DataPoint]
+    exact: bool = True
+    vectors: Dict[DataPoint, Dict[DataPoint, DataPoint]] = field(
+        default_factory=dict
+    )
+
+    @classmethod
+    def from_data(cls, D: List[DataPoint]):
+        points = sorted(set(D))
+        return cls(points, set(points), is_integral(points))
+
+    def extend(self, points):
+        """Add ``points``, which must all come after the indexed ones."""
+        self.points.extend(points)
+        self.lookup.update(points)
+        self.exact = self.exact and is_integral(points)
+        for start, vectors in self.vectors.items():
+            vectors.update(
+                (tuple(map(sub, end, start)), end) for end in points
+            )
+
+    def vectors_from(self, start):
+        """Map every vector ``q - start`` to its indexed point ``q``."""
+        vectors = self.vectors.get(start)
+        if vectors is None:
+            vectors = {tuple(map(sub, end, start)): end for end in self.points}
+            self.vectors[start] = vectors
+        return vectors
+
+    def translate(self, start, t, exact=True):
+        """Return the indexed point ``q`` with ``q - start == t``.
+
+        :param exact: [bool] whether the coordinates of ``start`` are whole
+            numbers as well
+        :raise KeyError: when ``t`` carries ``start`` out of the index
+        """
+        if exact and self.exact:
+            end = tuple(map(add, start, t))
+            if end not in self.lookup:
+                raise KeyError(end)
+            return end
+        return self.vectors_from(start)[t]
+
+    def covers(self, pattern, t, exact=True):
+        """Whether ``t`` carries every point of ``pattern`` into the index.
+
+        :param exact: [bool] whether the coordinates of ``pattern`` are
+            whole numbers as well
+        """
+        if exact and self.exact:
+            return all(tuple(map(add, p, t)) in self.lookup for p in pattern)
+        return all(t in self.vectors_from(p) for p in pattern)
+
+
+def is_integral(points):
+    """Whether every coordinate of ``points`` is a whole number small enough
+    for sums and differences of coordinates to be exact."""
+    return all(
+        isinstance(x, int) or (float(x).is_integer() and abs(x) <= MAX_EXACT)
+        for point in points
+        for x in point
+    )
+
+
+def compute_sorted_vectors(D, window=None, window_by="onset"):
+    """Build the sorted ``V`` table, optionally only for nearby points.
+
+    :param window: largest distance between the two points of a vector, or
+        ``None`` to pair every point with every later point
+    :param window_by: [str] "onset" to measure the distance along the first
+        coordinate of the (sorted) dataset, "index" to count dataset points
+    """
+    if window_by not in ("onset", "index"):
+        raise RuntimeError(f"Unsupported window measure: {window_by}")
+
+    V = list()
+    num_points = len(D)
+    onsets = [point[0] for point in D]
+    for i, start in enumerate(D):
+        stop = num_points
+        if window is None:
+            pass
+        elif window_by == "index":
+            stop = min(num_points, i + window + 1)
+        else:
+            stop = bisect_right(onsets, onsets[i] + window, i + 1)
+        for end in D[i + 1 : stop]:
+            V.append((tuple([e - s for s, e in zip(start, end)]), i))
+    return sorted(V)
+
+
+def compute_TEC_translators_indexed(D, index, I, min_translators=1):
+    pattern = [D[idx] for idx in I]
+    first = pattern[0]
+    exact = index.exact and is_integral(pattern)
+    if exact:
+        # A shifted copy cannot start beyond the point that moves the
+        # largest pattern point onto the end of the dataset
+        last = max(pattern)
+        bound = tuple(map(add, first, map(sub, index.points[-1], last)))
+        stop = bisect_right(index.points, bound)
+        results = [tuple(map(sub, end, first)) for end in index.points[:stop]]
+    else:
+        # Kept in the order of the indexed points they lead to
+        results = list(index.vectors_from(first))
+    for point in reversed(pattern[1:]):
+        if exact:
+            results = [
+                t for t in results if tuple(map(add, point, t)) in index.lookup
+            ]
+        else:
+            vectors = index.vectors_from(point)
+            results = [t for t in results if t in vectors]
+        if len(results) < min_translators:
+            return list()
+    return results
+
+
+# =============================================================================
+
+
+# =============================================================================
+# PACKED KEYS
+# =============================================================================
+def compute_sorted_vectors_packed(K):
+    V = list()
+    for i, start in enumerate(K):
+        V.extend([(end - start, i) for end in K[i + 1 :]])
+    return sorted(V)
+
+
+def compute_vector_representations_packed(K, V, min_size=1):
+    X, i = dict(), 0
+    num_vectors = len(V)
+    while i < num_vectors:
+        j = i + 1
+        while j < num_vectors and V[j][0] == V[i][0]:
+            j += 1
+        if j - i >= min_size:
+            starts = [K[V[idx][1]] for idx in range(i, j)]
+            X.setdefault(tuple(map(sub, starts[1:], starts)), i)
+        i = j
+
+    return sort_vector_sets(X)
+
+
+def compute_TEC_translators_packed(K, keys, lookup, I, min_translators=1):
+    first = K[I[0]]
+    stop = bisect_right(keys, first + keys[-1] - max([K[idx] for idx in I]))
+    results = [key - first for key in keys[:stop]]
+    for idx in reversed(I[1:]):
+        start = K[idx]
+        results = [t for t in results if start + t in lookup]
+        if len(results) < min_translators:
+            return list()
+    return results
+
+
+# =============================================================================
+
+
+# =============================================================================
+# TOLERANT MATCHING
+# =============================================================================
+class ToleranceGrid:
+    """Hash of points or vectors that matches coordinates up to ``tolerance``.
+
+    Entries are bucketed in grid cells as wide as the tolerance, so any
+    entry within ``tolerance`` of a query, coordinate by coordinate, lies in
+    the cell of the query or one of its neighbours. Lookups stay hash based
+    and only visit the 3^k cells around the query.
+    """
+
+    def __init__(self, tolerance, num_dims):
+        self.tolerance = tolerance
+        self.cells = dict()
+        self.neighbours = list(product((-1, 0, 1), repeat=num_dims))
+
+    def cell(self, point):
+        return tuple(floor(x / self.tolerance) for x in point)
+
+    def find(self, point):
+        """Return the nearest entry within the tolerance, or ``None``."""
+        cell = self.cell(point)
+        best, best_dist = None, self.tolerance
+        for offset in self.neighbours:
+            for entry in self.cells.get(tuple(map(add, cell, offset)), ()):
+                dist = max(abs(e - x) for e, x in zip(entry, point))
+                if dist <= best_dist:
+                    best, best_dist = entry, dist
+        return best
+
+    def insert(self, point):
+        self.cells.setdefault(self.cell(point), list()).append(point)
+
+    def snap(self, point):
+        """Map ``point`` to a matching entry, adding it if there is none.
+
+        Entries are never moved and are always further than the tolerance
+        apart, so every entry stands for the points nearer to it than to any
+        other entry.
+        """
+        entry = self.find(point)
+        if entry is None:
+            self.insert(point)
+            entry = point
+        return entry
+
+
+def compute_sorted_vectors_tolerant(D, grid):
+    """Build ``V`` with every vector snapped to its bucket in ``grid``.
+
+    Vectors are snapped in sorted order, so a bucket is represented by its
+    smallest member. A start point is kept once per bucket.
+    """
+    V = compute_sorted_vectors(D)
+    return sorted({(grid.snap(vec), i) for vec, i in V})
+
+
+def compute_vector_representations_tolerant(D, V, grid, min_size=1):
+    X, i = dict(), 0
+    num_vectors = len(V)
+    while i < num_vectors:
+        j = i + 1
+        while j < num_vectors and V[j][0] == V[i][0]:
+            j += 1
+        if j - i >= min_size:
+            starts = [D[V[k][1]] for k in range(i, j)]
+            Q = [
+                grid.snap(tuple(map(sub, e, s)))
+                for s, e in zip(starts, starts[1:])
+            ]
+            X.setdefault(tuple(Q), i)
+        i = j
+
+    return sort_vector_sets(X)
+
+
+def compute_TEC_translators_tolerant(D, grid, I, min_translators=1):
+    first = D[I[0]]
+    results = [tuple(map(sub, end, first)) for end in D]
+    for idx in reversed(I[1:]):
+        point = D[idx]
+        results = [
+            t
+            for t in results
+            if grid.find(tuple(map(add, point, t))) is not None
+        ]
+        if len(results) < min_translators:
+            return list()
+    return results
+
+
+# =============================================================================
+
+
+# =============================================================================
+# CROSS-DATASET
+# =============================================================================
+def compute_cross_vectors(D1, D2):
+    """Build the sorted ``V`` table of the vectors from ``D1`` into ``D2``.
+
+    Only the n * m pairs between the datasets are visited, none of the
+    pairs inside either of them.
+    """
+    V = list()
+    for i, start in enumerate(D1):
+        V.extend([(tuple(map(sub, end, start)), i) for end in D2])
+    return sorted(V)
+
+
+# =============================================================================
+
+
+def iter_TECs(D, min_pattern_size=1, min_translators=1, stats=NULL_STATS):
+    with stats.phase("vector_table"):
+        V, W = compute_vector_table(D)
+    stats.record(V=len(V), W=len(D) ** 2)
+    with stats.phase("vector_representations"):
+        Y = compute_vector_representations(D, V, min_pattern_size)
+    stats.record(Y=len(Y))
+    find_translators = partial(compute_TEC_translators, D, W)
+    return iter_TEC_set(D, V, Y, find_translators, min_translators, stats)
+
+
+def iter_TECs_indexed(
+    D,
+    window=None,
+    window_by="onset",
+    min_pattern_size=1,
+    min_translators=1,
+    stats=NULL_STATS,
+):
+    with stats.phase("vector_table"):
+        V = compute_sorted_vectors(D, window, window_by)
+        index = PointIndex.from_data(D)
+    stats.record(V=len(V))
+    with stats.phase("vector_representations"):
+        Y = compute_vector_representations(D, V, min_pattern_size)
+    stats.record(Y=len(Y))
+    find_translators = partial(
+        compute_TEC_translators_indexed,
+        D,
+        index,
+        min_translators=min_translators,
+    )
+    return iter_TEC_set(D, V, Y, find_translators, min_translators, stats)
+
+
+def iter_TECs_packed(
+    D,
+    resolution=None,
+    min_pattern_size=1,
+    min_translators=1,
+    stats=NULL_STATS,
+):
+    """Run SIATEC on packed integer keys instead of point tuples.
+
+    :param resolution: grid step used to quantize float coordinates, see
+        ``PointCodec.fit``. Without one the coordinates must be integers.
+    """
+    if len(D) < 2:
+        return iter(())
+    codec = PointCodec.fit(D, resolution)
+    if codec is None:
+        raise RuntimeError("Dataset does not fit in packed integer keys")
+
+    with stats.phase("vector_table"):
+        K = codec.encode(D).tolist()
+        V = compute_sorted_vectors_packed(K)
+        keys = sorted(set(K))
+        lookup = set(keys)
+    stats.record(V=len(V))
+    with stats.phase("vector_representations"):
+        Y = compute_vector_representations_packed(K, V, min_pattern_size)
+    stats.record(Y=len(Y))
+
+    def find_translators(I):
+        trans_set = compute_TEC_translators_packed(
+            K, keys, lookup, I, min_translators
+        )
+        return codec.decode_vectors(trans_set)
+
+    return iter_TEC_set(D, V, Y, find_translators, min_translators, stats)
+
+
+def iter_TECs_tolerant(
+    D, tolerance, min_pattern_size=1, min_translators=1, stats=NULL_STATS
+):
+    """Run SIATEC with coordinates matched up to ``tolerance``.
+
+    Difference vectors within the tolerance of each other are grouped as
+    one vector and translated pattern points only need to land within the
+    tolerance of a dataset point, which absorbs floating point noise such
+    as rounded fractional onsets.
+    """
+    if len(D) < 2:
+        return iter(())
+    with stats.phase("vector_table"):
+        vectors = ToleranceGrid(tolerance, len(D[0]))
+        V = compute_sorted_vectors_tolerant(D, vectors)
+        points = ToleranceGrid(tolerance, len(D[0]))
+        for point in D:
+            points.insert(point)
+    stats.record(V=len(V))
+    with stats.phase("vector_representations"):
+        Y = compute_vector_representations_tolerant(
+            D, V, vectors, min_pattern_size
+        )
+    stats.record(Y=len(Y))
+    find_translators = partial(
+        compute_TEC_translators_tolerant,
+        D,
+        points,
+        min_translators=min_translators,
+    )
+    return iter_TEC_set(D, V, Y, find_translators, min_translators, stats)
+
+
+def iter_TECs_cross(D1, D2, min_pattern_size=1, min_translators=1):
+    V = compute_cross_vectors(D1, D2)
+    Y = compute_vector_representations(D1, V, min_pattern_size)
+    index = PointIndex.from_data(D2)
+    find_translators = partial(
+        compute_TEC_translators_indexed,
+        D1,
+        index,
+        min_translators=min_translators,
+    )
+    return iter_TEC_set(D1, V, Y, find_translators, min_translators)
+
+
 # =============================================================================
 # Top-level routines
 # =============================================================================
-def siatec(D):
-    V, W = compute_vector_table(D)
-    Y = compute_vector_representations(D, V)
-    T = compute_TEC_set(D, V, W, Y)
-    betterT = [
-        TranslationalEquivalenceClass.from_data(t) for t in T if len(t[0]) > 1
+ENGINES = {
+    "python": iter_TECs,
+    "numpy": vectorized.iter_TECs,
+    "indexed": iter_TECs_indexed,
+    "packed": iter_TECs_packed,
+    "hash": hashtec.iter_TECs,
+}
+
+
+WINDOWED_ENGINES = ("indexed",)
+PARALLEL_ENGINES = ("numpy",)
+
+# Thresholds of ``choose_engine``, calibrated with ``scripts/benchmark.py``.
+# Below SMALL_DATASET points every engine runs in well under a millisecond
+# and the python engine has no setup cost. Up to LARGE_DATASET points the
+# numpy engine is fastest on grids with less than DENSE_GRID of their cells
+# occupied, above that and on denser grids the hash engine is.
+SMALL_DATASET = 16
+LARGE_DATASET = 300
+DENSE_GRID = 0.25
+
+# Datasets a ``siatec_many`` worker handles before it is replaced by a fresh
+# process, which hands memory kept by the allocator back to the system
+TASKS_PER_CHILD = 32
+
+
+@dataclass
+class EngineChoice:
+    """Engine picked by ``choose_engine`` and why.
+
+    :param engine: [str] name of the engine in ``ENGINES``
+    :param reason: [str] the property of the dataset or of the options
+        that decided the choice
+    """
+
+    engine: str
+    reason: str
+
+
+def mode_engine(window=None, workers=None, resolution=None, tolerance=None):
+    """Return the engine that runs the mode these options select.
+
+    Each mode runs on a single engine, so an engine is only chosen here
+    when one of the options is set.
+
+    :return: [EngineChoice] or ``None`` when no mode option is set
+    """
+    if tolerance is not None:
+        return EngineChoice("python", "only the python engine is tolerant")
+    if window is not None:
+        return EngineChoice("indexed", "only the indexed engine is windowed")
+    if workers is not None:
+        return EngineChoice("numpy", "parallel runs use the numpy engine")
+    if resolution is not None:
+        return EngineChoice("packed", "only the packed engine quantizes")
+    return None
+
+
+def choose_engine(
+    D, window=None, workers=None, resolution=None, tolerance=None
+):
+    """Pick the engine that runs fastest on ``D`` with these options.
+
+    Options only some engines support decide first, see ``mode_engine``.
+    Otherwise the choice follows the size of ``D`` and the fraction of the
+    cells of its bounding grid that hold a point, see ``SMALL_DATASET``.
+
+    :param D: sorted, duplicate free point set, see ``as_point_set``
+    """
+    choice = mode_engine(window, workers, resolution, tolerance)
+    if choice is not None:
+        return choice
+
+    n = len(D)
+    if n < SMALL_DATASET:
+        return EngineChoice("python", f"{n} points are too few for arrays")
+    if PointCodec.fit(D) is None:
+        return EngineChoice("numpy", "coordinates do not fit integer keys")
+
+    if n > LARGE_DATASET:
+        return EngineChoice("hash", f"{n} points are over {LARGE_DATASET}")
+
+    P = np.asarray(D)
+    density = n / np.prod((P.max(axis=0) - P.min(axis=0) + 1).astype(float))
+    if density >= DENSE_GRID:
+        return EngineChoice("hash", f"grid density {density:.3g} is dense")
+    return EngineChoice("numpy", f"grid density {density:.3g} is sparse")
+
+
+def siatec(
+    D,
+    engine=None,
+    window=None,
+    window_by="onset",
+    workers=None,
+    resolution=None,
+    tolerance=None,
+    compact=False,
+    cache=None,
+    stats=False,
+    min_pattern_size=2,
+    min_translators=1,
+):
+    """Find the TECs of ``D``, see ``siatec_iter`` for the options.
+
+    :param compact: [bool] return a ``TECSet`` holding every TEC in shared
+        flat arrays instead of a list of TECs
+    :param cache: [ResultCache] reuse the result of an earlier run on the
+        same dataset and options, and store the result of a new run
+    :param stats: [bool] also return the ``SiatecStats`` of the run. They
+        are handed to every exporter added with ``stats.add_exporter``.
+    """
+    D = as_point_set(D)
+    options = dict(
+        engine=engine,
+        window=window,
+        window_by=window_by,
+        resolution=resolution,
+        tolerance=tolerance,
+        min_pattern_size=min_pattern_size,
+        min_translators=min_translators,
+    )
+    if not stats:
+        return _run_siatec(D, options, workers, compact, cache)
+
+    run_stats = SiatecStats()
+    with run_stats.tracing():
+        TECs = _run_siatec(D, options, workers, compact, cache, run_stats)
+    run_stats.record(T=len(TECs))
+    run_stats.export()
+    return TECs, run_stats
+
+
+def _run_siatec(D, options, workers, compact, cache, stats=NULL_STATS):
+    TECs = None
+    if cache is not None:
+        with stats.phase("cache"):
+            key = cache.key(D, options)
+            TECs = cache.get(key)
+        stats.count(cache_hits=int(TECs is not None))
+    if TECs is None:
+        TECs = siatec_iter(D, workers=workers, stats=stats, **options)
+        if cache is not None:
+            TECs = TECSet.from_TECs(TECs)
+            with stats.phase("cache"):
+                cache.put(key, TECs)
+
+    if not isinstance(TECs, TECSet):
+        return TECSet.from_TECs(TECs) if compact else list(TECs)
+    if compact:
+        return TECs
+    return [
+        TranslationalEquivalenceClass(tec.pattern, tec.translators)
+        for tec in TECs
     ]
-    return betterT
 
 
-DataPoint = Tuple[int, float]
+def siatec_iter(
+    D,
+    engine=None,
+    filters=(),
+    window=None,
+    window_by="onset",
+    workers=None,
+    resolution=None,
+    tolerance=None,
+    stats=NULL_STATS,
+    min_pattern_size=2,
+    min_translators=1,
+):
+    """Lazily yield the TECs of ``D`` as their translators are found.
+
+    ``D`` is treated as a set: duplicate points are dropped and the rest
+    sorted lexicographically before any engine runs, so every engine sees
+    the same input and finds the same TECs.
+
+    :param engine: [str] name of the engine in ``ENGINES`` to run, or
+        "auto" to run the one ``choose_engine`` picks for ``D``. By default
+        the engine of the mode set by the options below runs, see
+        ``mode_engine``, and the python engine without one. The engine that
+        ran and the reason it was picked are kept in ``stats``.
+    :param filters: [Iterable] predicates that every yielded TEC must pass
+    :param window: only build patterns from pairs of points at most this far
+        apart, see ``compute_sorted_vectors``. Translators still cover the
+        whole dataset, so every result remains a valid TEC. Runs on the
+        indexed engine only.
+    :param window_by: [str] how ``window`` is measured, "onset" or "index"
+    :param workers: [int] run the numpy engine on a pool of this many
+        processes, see ``parallel.iter_TECs``
+    :param resolution: quantization grid of the packed engine, see
+        ``iter_TECs_packed``
+    :param tolerance: [float] match coordinates that differ by at most this
+        much, see ``iter_TECs_tolerant``. Runs on the python engine only.
+    :param stats: [SiatecStats] record the phases of the run as the TECs
+        are consumed. Memory is only traced inside ``stats.tracing()``.
+    :param min_pattern_size: [int] smallest pattern to report. Smaller
+        vector sets are dropped before their translators are searched.
+        Single point patterns are never reported.
+    :param min_translators: [int] smallest number of translators, counting
+        the zero vector, that a reported TEC has
+    """
+    D = as_point_set(D)
+    if engine is None:
+        choice = mode_engine(window, workers, resolution, tolerance)
+        choice = choice or EngineChoice("python", "the default engine")
+    elif engine == "auto":
+        choice = choose_engine(D, window, workers, resolution, tolerance)
+    else:
+        choice = EngineChoice(engine, "requested by the caller")
+    engine = choice.engine
+    if engine not in ENGINES:
+        raise RuntimeError(f"Unsupported SIATEC engine: {engine}")
+    if window is not None and workers is not None:
+        raise RuntimeError("Windowed SIATEC runs on a single process")
+    if resolution is not None and engine != "packed":
+        raise RuntimeError("Only the packed engine quantizes coordinates")
+    if tolerance is not None:
+        if engine != "python" or window is not None or workers is not None:
+            raise RuntimeError("Tolerant SIATEC runs on the python engine")
+        if tolerance <= 0:
+            raise RuntimeError(f"Unsupported SIATEC tolerance: {tolerance}")
+
+    limits = dict(
+        min_pattern_size=max(2, min_pattern_size),
+        min_translators=min_translators,
+        stats=stats,
+    )
+    if window is not None:
+        if engine not in WINDOWED_ENGINES:
+            raise RuntimeError(f"SIATEC engine {engine} has no windowed mode")
+        T = iter_TECs_indexed(D, window, window_by, **limits)
+    elif workers is not None:
+        if engine not in PARALLEL_ENGINES:
+            raise RuntimeError(f"SIATEC engine {engine} has no parallel mode")
+        T = parallel.iter_TECs(D, workers, **limits)
+    elif resolution is not None:
+        T = iter_TECs_packed(D, resolution, **limits)
+    elif tolerance is not None:
+        T = iter_TECs_tolerant(D, tolerance, **limits)
+        # The python engine with every coordinate match widened
+        engine = "tolerant"
+    else:
+        T = ENGINES[engine](D, **limits)
+    stats.record_engine(engine, choice.reason)
+    return (
+        tec
+        for tec in map(TranslationalEquivalenceClass.from_data, T)
+        if all(f(tec) for f in filters)
+    )
+
+
+def as_point_set(D):
+    """Return the distinct points of ``D`` in lexicographic order."""
+    return sorted(set(map(tuple, D)))
+
+
+def siatec_many(
+    datasets, workers=None, tasks_per_child=TASKS_PER_CHILD, **options
+):
+    """Run ``siatec`` on many datasets over a pool of processes.
+
+    The cost of a run grows much faster than the size of its dataset, so
+    datasets are handed out largest first and one at a time. Long runs
+    start early and the small ones fill the gaps at the end.
+
+    :param datasets: [Sequence] point sets to analyze
+    :param workers: [int] number of processes, all cores when ``None``
+    :param tasks_per_child: [int] datasets a process handles before it is
+        replaced, which keeps the memory of every worker bounded
+    :param options: passed on to ``siatec`` for every dataset
+    :return: [Iterator] ``(index, result)`` pairs in the order the runs
+        finish, where ``index`` is the position of the dataset
+    """
+    if options.get("engine") not in (*ENGINES, "auto", None):
+        raise RuntimeError(f"Unsupported SIATEC engine: {options['engine']}")
+
+    order = sorted(
+        range(len(datasets)), key=lambda i: len(datasets[i]), reverse=True
+    )
+    tasks = [(i, datasets[i], options) for i in order]
+    return _imap_pool(tasks, workers, tasks_per_child)
+
+
+def _imap_pool(tasks, workers, tasks_per_child):
+    with Pool(workers, maxtasksperchild=tasks_per_child) as pool:
+        yield from pool.imap_unordered(_siatec_task, tasks)
+
+
+def _siatec_task(task):
+    index, D, options = task
+    return index, siatec(D, **options)
+
+
+def siatec_cross(D1, D2, min_pattern_size=2, min_translators=1):
+    """Find the patterns of ``D1`` that also occur in ``D2``.
+
+    Every reported pattern is a maximal translatable pattern of ``D1`` for
+    some vector into ``D2`` and its translators are all the vectors that
+    carry it completely into ``D2``. As in ``siatec``, translationally
+    equivalent patterns of ``D1`` are reported once.
+
+    :param min_pattern_size: [int] smallest pattern to report
+    :param min_translators: [int] smallest number of occurrences in ``D2``
+    """
+    D1, D2 = sorted(set(D1)), sorted(set(D2))
+    T = iter_TECs_cross(
+        D1,
+        D2,
+        min_pattern_size=max(2, min_pattern_size),
+        min_translators=min_translators,
+    )
+    return list(map(TranslationalEquivalenceClass.from_data, T))
 
 
 @dataclass
@@ -0,0 +1,155 @@
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from time import perf_counter
+from typing import Dict, Optional
+
+# Callables handed every finished SiatecStats, see ``add_exporter``
+EXPORTERS = list()
+
+
+@dataclass
+class PhaseStats:
+    """Time and memory spent in one phase of a SIATEC run.
+
+    :param seconds: [float] total wall time spent in the phase
+    :param peak_bytes: [int] largest traced memory seen during the phase,
+        0 when memory is not traced
+    :param calls: [int] number of times the phase was entered
+    """
+
+    seconds: float = 0.0
+    peak_bytes: int = 0
+    calls: int = 0
+
+
+@dataclass
+class SiatecStats:
+    """Instrumentation record of a SIATEC run.
+
+    Engines time their phases with ``phase``, store the sizes of the
+    structures they build with ``record`` and increment loop counters with
+    ``count``. Phases may be entered many times, as the translator search
+    is for every pattern, and accumulate their time.
+
+    :param phases: [dict] ``PhaseStats`` by phase name, in the order the
+        phases first ran
+    :param sizes: [dict] number of entries of ``V``, ``W``, ``Y`` and ``T``
+    :param counts: [dict] counters of the translator search loop
+    :param engine: [str] name of the engine that ran, "tolerant" for
+        ``iter_TECs_tolerant``, ``None`` when the result came from a cache
+    :param engine_reason: [str] why that engine ran, see ``choose_engine``
+    :param trace_memory: [bool] track the peak memory of every phase with
+        ``tracemalloc``, which slows the run down
+    """
+
+    phases: Dict[str, PhaseStats] = field(default_factory=dict)
+    sizes: Dict[str, int] = field(default_factory=dict)
+    counts: Dict[str, int] = field(default_factory=dict)
+    engine: Optional[str] = None
+    engine_reason: Optional[str] = None
+    trace_memory: bool = True
+
+    @property
+    def seconds(self):
+        return sum(phase.seconds for phase in self.phases.values())
+
+    @contextmanager
+    def tracing(self):
+        """Trace memory allocations for the duration of a run."""
+        started = self.trace_memory and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            yield self
+        finally:
+            if started:
+                tracemalloc.stop()
+
+    @contextmanager
+    def phase(self, name):
+        stats = self.phases.setdefault(name, PhaseStats())
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        start = perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.seconds += perf_counter() - start
+            stats.calls += 1
+            if tracing:
+                peak = tracemalloc.get_traced_memory()[1]
+                stats.peak_bytes = max(stats.peak_bytes, peak)
+
+    def record(self, **sizes):
+        self.sizes.update(sizes)
+
+    def count(self, **counts):
+        for name, num in counts.items():
+            self.counts[name] = self.counts.get(name, 0) + num
+
+    def record_engine(self, engine, reason):
+        self.engine = engine
+        self.engine_reason = reason
+
+    def instrument(self, search, counts):
+        """Wrap a translator search so that every call is timed in the
+        "translators" phase and counted.
+
+        Engines only wrap their search when a run is instrumented, so runs
+        with ``NULL_STATS`` keep an untouched search loop.
+
+        :param search: [Callable] finds the translators of its argument
+        :param counts: [Callable] maps the argument and the result of a call
+            to the counters it adds
+        """
+
+        def timed(arg):
+            with self.phase("translators"):
+                result = search(arg)
+            self.count(**counts(arg, result))
+            return result
+
+        return timed
+
+    def to_dict(self):
+        stats = asdict(self)
+        del stats["trace_memory"]
+        return stats
+
+    def export(self):
+        for exporter in EXPORTERS:
+            exporter(self)
+
+
+class _NullStats:
+    """Stand-in for ``SiatecStats`` that records nothing."""
+
+    def phase(self, name):
+        return nullcontext()
+
+    def record(self, **sizes):
+        pass
+
+    def count(self, **counts):
+        pass
+
+    def record_engine(self, engine, reason):
+        pass
+
+
+NULL_STATS = _NullStats()
+
+
+def add_exporter(exporter):
+    """Call ``exporter`` with the ``SiatecStats`` of every instrumented run.
+
+    Lets metrics be forwarded to a monitoring system once, instead of at
+    every call to ``siatec``.
+    """
+    EXPORTERS.append(exporter)
+
+
+def remove_exporter(exporter):
+    EXPORTERS.remove(exporter)
@@ -0,0 +1,212 @@
+from dataclasses import dataclass
+from math import ceil
+
+import numpy as np
+
+from .siatec import TranslationalEquivalenceClass
+
+# Onsets covered by one chunk of a streamed dataset
+CHUNK_WIDTH = 2**12
+
+# Onsets sharing one random stream for their noise. It is fixed, so the
+# points do not depend on the chunk width they are streamed with.
+NOISE_BLOCK = 2**10
+
+
+@dataclass
+class PlantedDataset:
+    """Point set made of translated copies of motifs and uniform noise.
+
+    Only the motifs and the offsets of their copies are stored. Points are
+    drawn one chunk of onsets at a time, so datasets of millions of points
+    can be streamed into an engine or a file without ever being held whole.
+
+    :param motifs: [np.ndarray] ``(num_motifs, motif_size, 2)`` points of
+        every motif, each sorted
+    :param offsets: [np.ndarray] ``(num_copies, 2)`` translation of every
+        copy, sorted lexicographically
+    :param labels: [np.ndarray] motif of every copy
+    :param width: [int] number of onsets, points have onsets in
+        ``[0, width)`` and pitches in ``[0, height)``
+    :param height: [int] number of pitches
+    :param noise_rate: [float] probability that any cell of the grid holds
+        a noise point
+    :param seed: [int] seed of the noise
+    """
+
+    motifs: np.ndarray
+    offsets: np.ndarray
+    labels: np.ndarray
+    width: int
+    height: int
+    noise_rate: float
+    seed: int
+
+    def tecs(self):
+        """Return the planted TECs, one per motif.
+
+        The pattern of each is its copy at the smallest offset. Noise or
+        other copies may add occurrences that are not listed.
+        """
+        order = np.argsort(self.labels, kind="stable")
+        bounds = np.flatnonzero(np.diff(self.labels[order])) + 1
+        TECs = list()
+        for copies in np.split(order, bounds):
+            if not len(copies):
+                continue
+            offsets = self.offsets[copies]
+            pattern = self.motifs[self.labels[copies[0]]] + offsets[0]
+            TECs.append(
+                TranslationalEquivalenceClass(
+                    list(map(tuple, pattern.tolist())),
+                    list(map(tuple, (offsets - offsets[0]).tolist())),
+                )
+            )
+        return TECs
+
+    def iter_chunks(self, chunk_width=CHUNK_WIDTH):
+        """Yield the points as sorted, duplicate free ``(k, 2)`` arrays.
+
+        Chunks cover consecutive ranges of onsets, so the concatenated
+        chunks are sorted as well.
+        """
+        for start in range(0, self.width, chunk_width):
+            stop = min(start + chunk_width, self.width)
+            points = np.concatenate(
+                [self.noise(start, stop), self.copies(start, stop)]
+            )
+            # Sorting and deduplicating flat cell keys beats unique rows
+            keys = np.unique(points[:, 0] * self.height + points[:, 1])
+            if len(keys):
+                yield np.stack(np.divmod(keys, self.height), 1)
+
+    def noise(self, start, stop):
+        blocks = list()
+        for block in range(start // NOISE_BLOCK, ceil(stop / NOISE_BLOCK)):
+            rng = np.random.default_rng([self.seed, block])
+            cells = rng.random((NOISE_BLOCK, self.height)) < self.noise_rate
+            onsets, pitches = np.nonzero(cells)
+            onsets += block * NOISE_BLOCK
+            keep = (onsets >= start) & (onsets < stop)
+            blocks.append(np.stack([onsets[keep], pitches[keep]], 1))
+        return np.concatenate(blocks).astype(np.int64)
+
+    def copies(self, start, stop):
+        """Return the planted points with onsets in ``[start, stop)``."""
+        span = self.motifs[:, :, 0].max(initial=0)
+        lo = np.searchsorted(self.offsets[:, 0], start - span)
+        hi = np.searchsorted(self.offsets[:, 0], stop)
+        points = self.offsets[lo:hi, None, :] + self.motifs[self.labels[lo:hi]]
+        points = points.reshape(-1, 2)
+        return points[(points[:, 0] >= start) & (points[:, 0] < stop)]
+
+    def points(self, chunk_width=CHUNK_WIDTH):
+        """Return the whole dataset as a sorted list of point tuples."""
+        chunks = list(self.iter_chunks(chunk_width))
+        if not chunks:
+            return list()
+        return list(map(tuple, np.concatenate(chunks).tolist()))
+
+
+def plant(
+    size,
+    motif_size=4,
+    repeats=8,
+    density=0.05,
+    noise=0.5,
+    height=12,
+    motif_width=8,
+    seed=0,
+):
+    """Build a ``PlantedDataset`` of about ``size`` points.
+
+    :param size: [int] expected number of points. Copies that overlap
+        each other or the noise make the dataset slightly smaller.
+    :param motif_size: [int] number of points of every motif
+    :param repeats: [int] number of copies of every motif. Copies drawn at
+        the same offset twice are kept once.
+    :param density: [float] fraction of the grid cells holding a point,
+        which sets the width of the grid
+    :param noise: [float] fraction of the points that are noise, the rest
+        belongs to ``size * (1 - noise) / (motif_size * repeats)`` motifs
+    :param height: [int] number of pitches
+    :param motif_width: [int] number of onsets a motif spans at most
+    :param seed: [int] seed of the whole dataset
+    """
+    if not 0 <= noise <= 1 or not 0 < density <= 1:
+        raise RuntimeError("Noise and density must be fractions")
+    motif_height = max(1, height // 2)
+    if motif_size > motif_width * motif_height:
+        raise RuntimeError(f"Motifs of {motif_size} points do not fit")
+    width = max(motif_width, ceil(size / (height * density)))
+    rng = np.random.default_rng(seed)
+    num_motifs = round(size * (1 - noise) / (motif_size * repeats))
+
+    # The first motif_size cells of a random permutation of the motif box
+    cells = rng.random((num_motifs, motif_width * motif_height))
+    cells = np.sort(np.argsort(cells, axis=1)[:, :motif_size], axis=1)
+    motifs = np.stack(np.divmod(cells, motif_height), -1)
+
+    shift_height = height - motif_height + 1
+    shifts = rng.integers(
+        0, (width - motif_width + 1) * shift_height, (num_motifs, repeats)
+    )
+    shifts = np.sort(shifts, axis=1)
+    first = np.ones(shifts.shape, dtype=bool)
+    first[:, 1:] = shifts[:, 1:] != shifts[:, :-1]
+    labels = np.repeat(np.arange(num_motifs), repeats)[first.reshape(-1)]
+    offsets = np.stack(np.divmod(shifts[first], shift_height), -1)
+    order = np.lexsort((offsets[:, 1], offsets[:, 0]))
+
+    return PlantedDataset(
+        motifs.astype(np.int64),
+        offsets[order].astype(np.int64),
+        labels[order],
+        width,
+        height,
+        size * noise / (width * height),
+        seed,
+    )
+
+
+def recall(found, planted):
+    """Return the fraction of the planted occurrences that were found.
+
+    Every occurrence but the pattern of a planted TEC counts as found when
+    a found TEC has an occurrence holding the planted pattern and another
+    holding that occurrence. Exact engines find them all, since the
+    maximal translatable pattern of the vector between two copies holds
+    both of them.
+
+    :param found: [Iterable] TECs reported by an engine
+    :param planted: [List] ground truth TECs, see ``PlantedDataset.tecs``
+    """
+    found = [
+        (tec.pattern, set(tec.pattern), set(tec.translators)) for tec in found
+    ]
+    hits = total = 0
+    for tec in planted:
+        for translator in tec.translators[1:]:
+            total += 1
+            hits += any(
+                _covers(pattern, pattern_set, translators, tec, translator)
+                for pattern, pattern_set, translators in found
+                if len(pattern) >= len(tec.pattern)
+            )
+    return hits / total if total else 1.0
+
+
+def _covers(pattern, pattern_set, translators, tec, translator):
+    first = tec.pattern[0]
+    for point in pattern:
+        shift = tuple(p - f for p, f in zip(point, first))
+        if (
+            tuple(-s for s in shift) in translators
+            and tuple(t - s for t, s in zip(translator, shift)) in translators
+            and all(
+                tuple(p + s for p, s in zip(q, shift)) in pattern_set
+                for q in tec.pattern
+            )
+        ):
+            return True
+    return False
@@ -1,17 +1,9 @@
-from src.ostinato.music_utils import MusicElement
-import numpy as np
-
+from collections import Counter
+from dataclasses import dataclass, field
+from operator import add, sub
+from typing import List
 
-def getTecSetRep(T):
-    patternList = list()
-    for pattern, translators in T:
-        for translator in translators:
-            newPattern = tuple(
-                [vectorAddition(p, translator) for p in pattern]
-            )
-            patternList.append(newPattern)
-    patternList.sort()
-    return tuple(patternList)
+import numpy as np
 
 
 def randomSampleSetsLinear(minSize, maxSize, step, density, yRange=12):
@@ -31,24 +23,14 @@ def randomSampleSetsLinear(minSize, maxSize, step, density, yRange=12):
 
         numPoints = minSize + (step * i)
         xRange = int(numPoints / (yRange * density))
-        matrix = [(x, y) for x in range(xRange) for y in range(yRange)]
-        ind = np.random.choice(len(matrix), numPoints, replace=False)
-
-        outputList = []
-        for j in ind:
-            outputList.append(matrix[j])
-
-        result.append(outputList)
+        # Cells are drawn by index instead of from a list of the whole grid
+        ind = np.random.choice(xRange * yRange, numPoints, replace=False)
+        x, y = np.divmod(ind, yRange)
+        result.append(list(zip(x.tolist(), y.tolist())))
 
     return result
 
 
-def pitch_dataset(score):
-    return sorted(
-        [(sum(o), p) for (t, p, _, o) in score if t == MusicElement.NOTE]
-    )
-
-
 def vectorAddition(V1, V2):
     return tuple(v1 + v2 for v1, v2 in zip(V1, V2))
 
@@ -58,51 +40,132 @@ def vectorSubtraction(V1, V2):
 
 
 def diagnoseDiff(T1, T2, D):
-    print("{} total TECs in 1\t{} total TECs in 2".format(len(T1), len(T2)))
-    sets1 = getTecSetRep(T1)
-    sets2 = getTecSetRep(T2)
-
-    sets1 = sorted(sets1, key=lambda tup: len(tup))
-    sets2 = sorted(sets2, key=lambda tup: len(tup))
-
-    inBoth = 0
-    in1 = 0
-    in2 = 0
-    in1NotData = 0
-    in2NotData = 0
-    lengthsMissed = list()
-    for pattern in sets1:
-        if pattern not in sets2:
-            in1 += 1
-            if not (set(pattern) <= set(D)):
-                in1NotData += 1
-            lengthsMissed.append(len(pattern))
-            print("Pattern in 1 not 2: {}".format(pattern))
-        else:
-            inBoth += 1
-
-    for pattern in sets2:
-        if pattern not in sets1:
-            in2 += 1
-            if not (set(pattern) <= set(D)):
-                in2NotData += 1
-            print("Pattern in 2 not 1: {}".format(pattern))
-    print(
-        "{} patterns were found by both\n{} patterns were found only by method 1\n{} were found only by method 2".format(
-            inBoth, in1, in2
-        )
-    )
-    print(
-        "{} patterns found in 1 not in 2 are not in D\n{} patterns found in 2 not in 1 are not in D".format(
-            in1NotData, in2NotData
-        )
-    )
-    print(
-        "Lengths of missed patterns from 1: {}".format(
-            list(set(lengthsMissed))
+    """Compare two TEC sets found on ``D``, see ``compare_tec_sets``."""
+    return compare_tec_sets(T1, T2, D)
+
+
+def isEquivTecSets(T1, T2):
+    return compare_tec_sets(T1, T2).equal
+
+
+# =============================================================================
+# TEC SET COMPARISON
+# =============================================================================
+def fingerprint(tec):
+    """Canonical, hashable key of the occurrences of a TEC.
+
+    TECs are equal when they cover the same occurrences, whichever
+    occurrence is their pattern. Every occurrence is anchored at its
+    smallest point, so the key is the shape of the pattern relative to its
+    anchor along with the sorted anchors of all occurrences.
+
+    :param tec: a TEC or a ``(pattern, translators)`` pair
+    """
+    pattern, translators = _unpack(tec)
+    points = sorted(map(tuple, pattern))
+    anchor = points[0]
+    shape = tuple([tuple(map(sub, point, anchor)) for point in points])
+    anchors = sorted([tuple(map(add, anchor, t)) for t in translators])
+    return shape, tuple(anchors)
+
+
+def _unpack(tec):
+    if hasattr(tec, "pattern"):
+        return tec.pattern, tec.translators
+    return tec
+
+
+@dataclass
+class TecSetDiff:
+    """Differences between two TEC sets, as found by ``compare_tec_sets``.
+
+    :param num_first: [int] number of TECs in the first set
+    :param num_second: [int] number of TECs in the second set
+    :param common: [int] number of TECs found in both sets
+    :param only_first: [List] TECs of the first set missing from the second
+    :param only_second: [List] TECs of the second set missing from the first
+    :param outside_first: [List] TECs of ``only_first`` with an occurrence
+        that is not in the dataset, only filled when it is given
+    :param outside_second: [List] same for ``only_second``
+    """
+
+    num_first: int
+    num_second: int
+    common: int
+    only_first: List = field(default_factory=list)
+    only_second: List = field(default_factory=list)
+    outside_first: List = field(default_factory=list)
+    outside_second: List = field(default_factory=list)
+
+    @property
+    def equal(self):
+        return not self.only_first and not self.only_second
+
+    def missed_sizes(self):
+        """Return the distinct pattern sizes of ``only_first``."""
+        return sorted({len(_unpack(tec)[0]) for tec in self.only_first})
+
+    def __str__(self):
+        return (
+            f"{self.num_first} TECs in 1, {self.num_second} TECs in 2: "
+            f"{self.common} in both, {len(self.only_first)} only in 1, "
+            f"{len(self.only_second)} only in 2"
         )
+
+
+def compare_tec_sets(T1, T2, D=None):
+    """Compare two TEC sets in time linear in their total size.
+
+    Each TEC is reduced to its ``fingerprint``, so the order of the TECs and
+    the choice of their patterns do not matter, while repeated TECs are
+    counted.
+
+    :param T1: [Iterable] TECs or ``(pattern, translators)`` pairs
+    :param T2: [Iterable] TECs or ``(pattern, translators)`` pairs
+    :param D: the dataset both sets were found on, to tell which of the
+        differing TECs have occurrences outside of it
+    :return: [TecSetDiff]
+    """
+    T1, T2 = list(T1), list(T2)
+    keys1, keys2 = list(map(fingerprint, T1)), list(map(fingerprint, T2))
+    counts1, counts2 = Counter(keys1), Counter(keys2)
+
+    only_first = _unmatched(T1, keys1, counts2)
+    only_second = _unmatched(T2, keys2, counts1)
+    diff = TecSetDiff(
+        len(T1),
+        len(T2),
+        sum((counts1 & counts2).values()),
+        only_first,
+        only_second,
     )
+    if D is not None:
+        points = set(map(tuple, D))
+        diff.outside_first = [
+            tec for tec in only_first if not _covered(tec, points)
+        ]
+        diff.outside_second = [
+            tec for tec in only_second if not _covered(tec, points)
+        ]
+    return diff
+
+
+def _unmatched(T, keys, other):
+    """Return the TECs of ``T`` left over once ``other`` is matched."""
+    left = Counter(other)
+    unmatched = list()
+    for tec, key in zip(T, keys):
+        if left[key] > 0:
+            left[key] -= 1
+        else:
+            unmatched.append(tec)
+    return unmatched
 
 
-def isEquivTecSets(T1, T2):
-    return getTecSetRep(T1) == getTecSetRep(T2)
+def _covered(tec, points):
+    shape, anchors = fingerprint(tec)
+    return all(
+        vectorAddition(anchor, offset) in points
+        for anchor in anchors
+        for offset in shape
+    )
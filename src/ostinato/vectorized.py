@@ -0,0 +1,232 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .keys import PointCodec
+from .stats import NULL_STATS
+
+# Upper bound on the number of candidate translators held in memory by a
+# single batched translator search
+BATCH_ELEMENTS = 2**20
+
+
+# =============================================================================
+# VECTOR TABLE
+# =============================================================================
+@dataclass
+class VectorTable:
+    """Array form of the SIATEC vector tables.
+
+    Every difference vector is stored as a packed integer key whose order
+    matches the lexicographic order of the vector, so sorting and equality
+    checks never touch Python tuples.
+
+    :param points: (n, k) array of dataset coordinates
+    :param order: permutation that sorts ``points`` lexicographically
+    :param rank: inverse of ``order``
+    :param W: (n, n) keys of ``points[order[r]] - points[i]``, sorted per row
+    :param V: keys of ``points[j] - points[i]`` for all ``i < j``, sorted
+    :param starts: start index ``i`` of every entry in ``V``
+    :param radix: exclusive upper bound of the keys in ``W``
+    """
+
+    points: np.ndarray
+    order: np.ndarray
+    rank: np.ndarray
+    W: np.ndarray
+    V: np.ndarray
+    starts: np.ndarray
+    radix: int
+
+    def flat_rows(self):
+        """Return ``W`` as one globally sorted array of row-offset keys."""
+        n = len(self.W)
+        offsets = np.arange(n, dtype=np.int64)[:, None] * self.radix
+        return (self.W + offsets).reshape(-1)
+
+
+def as_point_array(D):
+    P = np.asarray(D)
+    return P.reshape(len(P), -1)
+
+
+def pack_rows(A):
+    """Map the rows of ``A`` to int64 keys preserving lexicographic order.
+
+    :return: [Tuple] the keys and an exclusive upper bound on their values
+    """
+    keys = np.zeros(len(A), dtype=np.int64)
+    radix = 1
+    for col in A.T:
+        values, codes = np.unique(col, return_inverse=True)
+        radix *= len(values)
+        if radix >= 2**63:
+            return dense_keys(A)
+        keys = keys * len(values) + codes.reshape(-1)
+    return keys, radix
+
+
+def dense_keys(A):
+    values, codes = np.unique(A, axis=0, return_inverse=True)
+    return codes.reshape(-1).astype(np.int64), len(values)
+
+
+def compute_vector_table(D):
+    P = as_point_array(D)
+    n = len(P)
+    order = np.lexsort(P.T[::-1])
+    rank = np.empty(n, dtype=np.intp)
+    rank[order] = np.arange(n)
+
+    # Lexicographic order is translation invariant, so every row of the
+    # difference matrix is sorted once its columns follow ``order``
+    codec = PointCodec.fit(P)
+    if codec is not None:
+        # Packed point keys subtract straight into packed vector keys
+        K = codec.encode(P)
+        W = (K[order][None, :] - K[:, None]).reshape(-1)
+        W -= W.min()
+        radix = int(W.max()) + 1
+    else:
+        diffs = P[order][None, :, :] - P[:, None, :]
+        W, radix = pack_rows(diffs.reshape(n * n, -1))
+    if n * radix >= 2**63:
+        W, radix = dense_keys(W[:, None])
+    W = W.reshape(n, n)
+
+    i, j = np.triu_indices(n, 1)
+    keys = W[i, rank[j]]
+    srt = np.lexsort((i, keys))
+    return VectorTable(P, order, rank, W, keys[srt], i[srt], radix)
+
+
+def compute_vector_representations(table, min_size=1):
+    """Group ``V`` by vector and order the groups like the Python engine.
+
+    Returns the ``V`` offset and size of every distinct vector set, sorted by
+    ``(len(Q), Q, offset)`` with translationally equivalent sets removed.
+    Sets with fewer than ``min_size`` vectors are left out.
+    """
+    V, starts = table.V, table.starts
+    first = np.flatnonzero(np.diff(V, prepend=V[:1] - 1))
+    sizes = np.diff(first, append=len(V))
+
+    offsets, lengths = list(), list()
+    for size in np.unique(sizes[sizes >= min_size]):
+        grp = first[sizes == size]
+        if size == 1:
+            # A single start point always has an empty Q
+            grp = grp[:1]
+        else:
+            S = starts[grp[:, None] + np.arange(size)]
+            Q = table.W[S[:, :-1], table.rank[S[:, 1:]]]
+            srt = np.lexsort((grp,) + tuple(Q.T[::-1]))
+            Q, grp = Q[srt], grp[srt]
+            keep = np.ones(len(grp), dtype=bool)
+            keep[1:] = np.any(Q[1:] != Q[:-1], axis=1)
+            grp = grp[keep]
+        offsets.append(grp)
+        lengths.append(np.full(len(grp), size))
+
+    if not offsets:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    return np.concatenate(offsets), np.concatenate(lengths)
+
+
+def compute_TEC_set(D, table, Y):
+    return list(iter_TEC_set(D, table, Y))
+
+
+def iter_TEC_set(D, table, Y, min_translators=1, stats=NULL_STATS):
+    T = iter_translator_sets(table, Y, None, min_translators, stats)
+    for I, trans_set in T:
+        if len(trans_set) >= min_translators:
+            yield ([D[index] for index in I], trans_set)
+
+
+def iter_translator_sets(
+    table, Y, flat=None, min_translators=1, stats=NULL_STATS
+):
+    """Yield the point indices and translators of every vector set in Y."""
+    if flat is None:
+        flat = table.flat_rows()
+
+    def search(S):
+        return compute_TEC_translators(table, S, flat, min_translators)
+
+    if stats is not NULL_STATS:
+        search = stats.instrument(search, batch_counts)
+    batch = max(1, BATCH_ELEMENTS // len(table.W))
+    offsets, sizes = Y
+    i, num_vector_sets = 0, len(offsets)
+    while i < num_vector_sets:
+        # Batch consecutive vector sets of equal size, which keeps the
+        # output in the order of Y
+        size = sizes[i]
+        j = min(i + batch, num_vector_sets)
+        j = i + int(np.searchsorted(sizes[i:j], size, side="right"))
+        S = table.starts[offsets[i:j, None] + np.arange(size)]
+        yield from zip(S.tolist(), search(S))
+        i = j
+
+
+def batch_counts(S, trans_sets):
+    return dict(
+        translator_batches=1,
+        translator_searches=len(S),
+        pattern_points=S.size,
+        translators=sum(map(len, trans_sets)),
+    )
+
+
+def compute_TEC_translators(table, S, flat=None, min_translators=1):
+    """Find the translators of a batch of equally sized patterns.
+
+    A translator of pattern ``S[b]`` is a key present in every row
+    ``W[S[b, k]]``. Candidates start as the first row and are filtered by
+    binary search against each further row of the flattened ``W``.
+
+    :param S: (B, m) array of pattern point indices, one pattern per row
+    :param min_translators: [int] patterns left with fewer candidates are
+        dropped from the search and get no translators
+    :return: [List] sorted translator tuples for every pattern
+    """
+    if flat is None:
+        flat = table.flat_rows()
+    W, radix = table.W, table.radix
+    B, n = len(S), W.shape[1]
+
+    rows = W[S[:, 0]]
+    unique = np.ones(rows.shape, dtype=bool)
+    unique[:, 1:] = rows[:, 1:] != rows[:, :-1]
+    b = np.nonzero(unique)[0]
+    keys = rows[unique]
+    for k in range(1, S.shape[1]):
+        queries = S[b, k] * radix + keys
+        pos = np.searchsorted(flat, queries)
+        hit = flat[np.minimum(pos, len(flat) - 1)] == queries
+        if min_translators > 1:
+            hit &= np.bincount(b[hit], minlength=B)[b] >= min_translators
+        b, keys = b[hit], keys[hit]
+
+    starts = S[b, 0]
+    cols = np.searchsorted(flat, starts * radix + keys) - starts * n
+    vecs = table.points[table.order[cols]] - table.points[starts]
+    vecs = [tuple(v) for v in vecs.tolist()]
+    bounds = np.cumsum(np.bincount(b, minlength=B)).tolist()
+    return [vecs[lo:hi] for lo, hi in zip([0] + bounds, bounds)]
+
+
+# =============================================================================
+
+
+def iter_TECs(D, min_pattern_size=1, min_translators=1, stats=NULL_STATS):
+    if len(D) < 2:
+        return iter(())
+    with stats.phase("vector_table"):
+        table = compute_vector_table(D)
+    stats.record(V=len(table.V), W=table.W.size)
+    with stats.phase("vector_representations"):
+        Y = compute_vector_representations(table, min_pattern_size)
+    stats.record(Y=len(Y[0]))
+    return iter_TEC_set(D, table, Y, min_translators, stats)
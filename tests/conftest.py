@@ -226,3 +226,11 @@ def big_shifted_retro_dataset():
 @pytest.fixture
 def geometric_data():
     return [(1, 1), (2, 1), (2, 2), (3, 2), (1, 3), (2, 3)]
+
+
+@pytest.fixture
+def fractional_dataset():
+    # Tenths do not add up exactly as floats: 0.8 + (0.5 - 0.2) == 1.1 but
+    # 1.1 - 0.8 != 0.5 - 0.2
+    D = [(0.2, 0), (0.8, 1), (0.8, 0), (1.1, 2), (0.2, 1), (0.5, 2)]
+    return sorted(set(D) | {(k / 10, k % 3) for k in range(1, 16)})
@@ -0,0 +1,43 @@
+import importlib.util
+import json
+from itertools import product
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).parents[1] / "scripts" / "benchmark.py"
+
+
+@pytest.fixture(scope="module")
+def benchmark():
+    spec = importlib.util.spec_from_file_location("benchmark", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_default_sweep_datasets(benchmark):
+    # Narrow grids cannot hold size * regularity distinct motif copies
+    cases = product(
+        benchmark.SIZES, benchmark.DENSITIES, benchmark.REGULARITIES
+    )
+    for size, density, regularity in cases:
+        D = benchmark.make_dataset(size, density, regularity, seed=0)
+        assert len(D) == size
+        assert D == sorted(set(D))
+        assert D == benchmark.make_dataset(size, density, regularity, 0)
+
+
+def test_baseline_covers_default_sweep(benchmark):
+    with open(benchmark.BASELINE) as infile:
+        baseline = json.load(infile)
+    cases = benchmark.iter_cases(
+        benchmark.SIZES,
+        benchmark.DENSITIES,
+        benchmark.REGULARITIES,
+        benchmark.MODES,
+        seed=0,
+    )
+    names = [result["name"] for result in baseline["results"]]
+    assert names == [case["name"] for case in cases]
+    assert benchmark.compare(baseline, baseline) == []
@@ -0,0 +1,96 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import ostinato.siatec as siatec_module
+
+from ostinato.cache import ResultCache
+from ostinato.results import TECSet
+from ostinato.siatec import siatec
+
+
+def test_cache_hit(monkeypatch, tmp_path, big_shifted_retro_dataset):
+    D = big_shifted_retro_dataset
+    cache = ResultCache(tmp_path)
+    expected = siatec(D, min_translators=2)
+    assert siatec(D, cache=cache, min_translators=2) == expected
+    assert len(cache.entries()) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("siatec ran on a cache hit")
+
+    monkeypatch.setattr(siatec_module, "siatec_iter", fail)
+    assert siatec(D, cache=cache, min_translators=2) == expected
+    compact = siatec(D, cache=cache, compact=True, min_translators=2)
+    assert list(compact) == expected
+
+
+def test_cache_keeps_types(tmp_path):
+    D = [(k, 60.5 + k % 3) for k in range(12)]
+    cache = ResultCache(tmp_path)
+    expected = repr(siatec(D))
+    assert repr(siatec(D, cache=cache)) == expected
+    assert repr(siatec(D, cache=cache)) == expected
+    assert repr(list(siatec(D, cache=cache, compact=True))) == expected
+
+
+def test_cache_keys(tmp_path, regular_dataset, retro_dataset):
+    cache = ResultCache(tmp_path)
+    options = dict(engine="python", min_translators=1)
+    key = cache.key(regular_dataset, options)
+    assert key == ResultCache(tmp_path).key(list(regular_dataset), options)
+    assert key != cache.key(retro_dataset, options)
+    assert key != cache.key(regular_dataset, dict(options, engine="numpy"))
+    floats = [tuple(map(float, p)) for p in regular_dataset]
+    assert key != cache.key(floats, options)
+    mixed = [(x, y / 2) for x, y in regular_dataset]
+    halves = [(float(x), y / 2) for x, y in regular_dataset]
+    assert cache.key(mixed, options) != cache.key(halves, options)
+
+
+def test_cache_results_by_options(tmp_path, big_shifted_retro_dataset):
+    D = big_shifted_retro_dataset
+    cache = ResultCache(tmp_path)
+    for size in (2, 3, 4):
+        assert siatec(D, cache=cache, min_pattern_size=size) == siatec(
+            D, min_pattern_size=size
+        )
+    assert len(cache.entries()) == 3
+    assert siatec([], cache=cache) == []
+
+
+def test_concurrent_writers(monkeypatch, tmp_path, big_shifted_retro_dataset):
+    cache = ResultCache(tmp_path)
+    tec_set = siatec(big_shifted_retro_dataset, compact=True)
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: cache.put("key", tec_set), range(32)))
+    assert cache.get("key") == tec_set
+    assert sorted(os.listdir(tmp_path)) == ["key.tecs"]
+
+    def fail(self, path):
+        open(path, "wb").close()
+        raise OSError("disk full")
+
+    monkeypatch.setattr(TECSet, "save", fail)
+    with pytest.raises(OSError):
+        cache.put("other", tec_set)
+    assert sorted(os.listdir(tmp_path)) == ["key.tecs"]
+
+
+def test_cache_eviction(tmp_path, regular_dataset, retro_dataset, v_dataset):
+    cache = ResultCache(tmp_path)
+    for stamp, D in enumerate([regular_dataset, retro_dataset, v_dataset]):
+        siatec(D, cache=cache)
+        path = cache.entries()[-1][2]
+        os.utime(path, (stamp, stamp))
+
+    oldest, _, newest = [entry[2] for entry in cache.entries()]
+    cache.get(oldest.stem)
+    cache.max_bytes = cache.nbytes - 1
+    cache.evict()
+    assert sorted(entry[2] for entry in cache.entries()) == sorted(
+        [oldest, newest]
+    )
+    cache.clear()
+    assert cache.nbytes == 0
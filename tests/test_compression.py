@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from ostinato.compression import (
+    Encoding,
+    compression_ratio,
+    cosiatec,
+    coverage,
+    siatec_compress,
+)
+from ostinato.fuzz import fraction_points
+from ostinato.siatec import siatec
+
+
+def check_encoding(D, encoding):
+    assert isinstance(encoding, Encoding)
+    assert encoding.points() == sorted(set(D))
+    assert encoding.size <= len(set(D))
+    for tec in encoding.tecs:
+        assert compression_ratio(tec) > 1
+
+
+@pytest.mark.parametrize(
+    "name",
+    ["regular_dataset", "repeated_retro_dataset", "big_shifted_retro_dataset"],
+)
+def test_cosiatec(name, request):
+    D = request.getfixturevalue(name)
+    encoding = cosiatec(D)
+    check_encoding(D, encoding)
+    assert encoding == cosiatec(D, incremental=False)
+
+
+def test_cosiatec_random():
+    rng = random.Random(3)
+    motif = [(0, 0), (1, 2), (2, 4), (4, 3)]
+    D = {(rng.randint(0, 80), rng.randint(0, 20)) for _ in range(30)}
+    D |= {(x + dx, y + 5) for dx in (0, 20, 45) for x, y in motif}
+    encoding = cosiatec(D)
+    check_encoding(D, encoding)
+    assert encoding.compression_ratio > 1
+    assert encoding == cosiatec(D, incremental=False)
+
+
+def test_siatec_compress(repeated_retro_dataset):
+    D = repeated_retro_dataset
+    encoding = siatec_compress(D)
+    check_encoding(D, encoding)
+    assert encoding.compression_ratio > 1
+
+
+def test_coverage(regular_dataset):
+    for tec in siatec(regular_dataset):
+        assert coverage(tec) <= set(regular_dataset)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_compression_fractional(seed):
+    check_round_trips(fraction_points(random.Random(seed), 25))
+
+
+def test_compression_fractional_dataset(fractional_dataset):
+    check_round_trips(fractional_dataset)
+
+
+def check_round_trips(D):
+    encoding = cosiatec(D)
+    check_encoding(D, encoding)
+    assert encoding == cosiatec(D, incremental=False)
+    check_encoding(D, siatec_compress(D))
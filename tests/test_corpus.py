@@ -0,0 +1,80 @@
+import random
+from operator import add, sub
+
+import pytest
+
+from ostinato.corpus import CorpusIndex
+from ostinato.siatec import siatec
+
+
+def brute_force_occurrences(pieces, pattern):
+    found = dict()
+    for name, D in pieces.items():
+        lookup = set(D)
+        trans = sorted(
+            {
+                tuple(map(sub, q, pattern[0]))
+                for q in D
+                if all(
+                    tuple(map(add, p, map(sub, q, pattern[0]))) in lookup
+                    for p in pattern
+                )
+            }
+        )
+        if trans:
+            found[name] = trans
+    return found
+
+
+@pytest.fixture
+def pieces(regular_dataset, repeated_retro_dataset):
+    rng = random.Random(13)
+    motif = [(0, 60), (1, 64), (2, 67), (4, 64)]
+    corpus = {"regular": regular_dataset, "retro": repeated_retro_dataset}
+    for k in range(4):
+        D = {(rng.randint(0, 40), rng.randint(55, 70)) for _ in range(40)}
+        D |= {(x + 10 * k, y + k) for x, y in motif}
+        corpus[f"random-{k}"] = sorted(D)
+    return corpus
+
+
+@pytest.mark.parametrize("span", [None, 2, 0])
+def test_query(span, pieces):
+    index = CorpusIndex(pieces, span=span)
+    patterns = [tec.pattern for tec in siatec(pieces["random-1"])[-20:]]
+    patterns.append([(5, 62), (6, 66), (7, 69), (9, 66)])
+    for pattern in patterns:
+        assert index.query(pattern) == brute_force_occurrences(pieces, pattern)
+
+
+def test_query_many(pieces):
+    index = CorpusIndex(pieces, span=3)
+    patterns = [tec.pattern for tec in siatec(pieces["random-2"])[-10:]]
+    patterns += [[(x + 3, y - 1) for x, y in P] for P in patterns] + [[]]
+    assert index.query_many(patterns) == list(map(index.query, patterns))
+
+
+def test_query_fractional(pieces, fractional_dataset):
+    pieces["fractional"] = fractional_dataset
+    index = CorpusIndex(pieces)
+    TECs = siatec(fractional_dataset)
+    for tec in TECs:
+        found = index.query(tec.pattern)
+        assert found["fractional"] == sorted(tec.translators)
+    patterns = [tec.pattern for tec in TECs + siatec(pieces["random-0"])[-5:]]
+    assert index.query_many(patterns) == list(map(index.query, patterns))
+
+
+def test_save_and_load(tmp_path, pieces):
+    index = CorpusIndex(list(pieces.values()), span=2)
+    index.save(tmp_path / "corpus.idx")
+    loaded = CorpusIndex.load(tmp_path / "corpus.idx")
+    assert len(loaded) == len(pieces)
+    pattern = [(0, 60), (1, 64), (2, 67)]
+    assert loaded.query(pattern) == index.query(pattern)
+
+
+def test_add_duplicate_piece(pieces):
+    index = CorpusIndex(pieces)
+    with pytest.raises(RuntimeError):
+        index.add("regular", pieces["regular"])
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+import ostinato.siatec as siatec_module
+
+from ostinato.fuzz import GENERATORS, MODES, canonical, fuzz, shrink
+from ostinato.siatec import siatec
+
+
+@pytest.mark.parametrize("kind", list(GENERATORS))
+def test_fuzz(kind):
+    modes = [mode for mode in MODES if mode != "parallel"]
+    failures = fuzz(num_cases=10, seed=1, kinds=[kind], modes=modes)
+    assert not failures, "\n".join(map(str, failures))
+
+
+def test_fuzz_parallel():
+    failures = fuzz(num_cases=2, seed=1, kinds=["regular"], modes=["parallel"])
+    assert not failures, "\n".join(map(str, failures))
+
+
+def test_fuzz_finds_rounding(monkeypatch):
+    # Hashing p + t as on whole numbers misses that fractions round
+    monkeypatch.setattr(siatec_module, "is_integral", lambda points: True)
+    failures = fuzz(
+        num_cases=10, seed=1, kinds=["fractions"], modes=["indexed"]
+    )
+    assert failures
+    assert all(len(failure.points) <= 6 for failure in failures)
+
+
+def test_shrink():
+    D = [(i, i % 3) for i in range(40)]
+    culprits = {(7, 1), (22, 1)}
+    shrunk = shrink(D, lambda P: culprits <= set(P))
+    assert sorted(shrunk) == sorted(culprits)
+
+
+@pytest.mark.parametrize(
+    "engine", ["python", "numpy", "indexed", "packed", "hash"]
+)
+def test_siatec_point_set(engine):
+    D = GENERATORS["duplicates"](random.Random(3), 30)
+    assert len(set(D)) < len(D)
+    assert canonical(siatec(D, engine=engine)) == canonical(
+        siatec(sorted(set(D)), engine="python")
+    )
@@ -0,0 +1,48 @@
+import pytest
+
+from ostinato.hashtec import compute_mtp_table, hashTEC
+from ostinato.keys import PointCodec
+from ostinato.siatec import TranslationalEquivalenceClass, siatec
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "elbow_dataset",
+        "retro_dataset",
+        "repeated_retro_dataset",
+        "big_shifted_retro_dataset",
+        "geometric_data",
+    ],
+)
+def test_hash_engine(name, request):
+    D = request.getfixturevalue(name)
+    TECs = hashTEC(D)
+    assert TECs == siatec(D)
+    assert all(isinstance(t, TranslationalEquivalenceClass) for t in TECs)
+
+
+def test_mtp_table(mid_inv_elbow_dataset):
+    D = mid_inv_elbow_dataset
+    K = PointCodec.fit(D).encode(D)
+    mtps = compute_mtp_table(K)
+    keys = K.tolist()
+    for vector in {end - start for start in keys for end in keys}:
+        starts = [key for key in keys if key + vector in set(keys)]
+        if vector > 0 and len(starts) > 1:
+            assert mtps.pop(vector) == starts
+    assert not mtps
+
+
+@pytest.mark.parametrize("step", [1 / 4, 1 / 10, 1 / 3])
+def test_hash_engine_floats(step, regular_dataset):
+    D = [(x * step, y) for x, y in regular_dataset]
+    assert hashTEC(D) == siatec(D)
+    limits = dict(min_pattern_size=3, min_translators=2)
+    assert hashTEC(D, **limits) == siatec(D, **limits)
+
+
+def test_hash_engine_fractional(fractional_dataset):
+    assert hashTEC(fractional_dataset) == siatec(fractional_dataset)
+    D = [(0, 60.5), (1, 62), (2, 60.5), (3, 62), (4, 61.5)]
+    assert hashTEC(D) == siatec(D)
@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from ostinato.fuzz import fraction_points
+from ostinato.incremental import SiatecSession
+from ostinato.siatec import siatec
+
+
+@pytest.mark.parametrize(
+    "name",
+    ["regular_dataset", "repeated_retro_dataset", "big_shifted_retro_dataset"],
+)
+def test_append_one_at_a_time(name, request):
+    D = sorted(set(request.getfixturevalue(name)))
+    session = SiatecSession()
+    for end in range(len(D)):
+        session.append(D[end : end + 1])
+        assert session.results() == siatec(D[: end + 1])
+
+
+def test_append_batches():
+    rng = random.Random(5)
+    D = sorted({(rng.randint(0, 40), rng.randint(0, 6)) for _ in range(70)})
+    session = SiatecSession(D[:10], min_pattern_size=3, min_translators=2)
+    for start in range(10, len(D), 7):
+        session.append(D[start : start + 7])
+        expected = siatec(
+            D[: start + 7], min_pattern_size=3, min_translators=2
+        )
+        assert session.results() == expected
+    assert len(session) == len(D)
+
+
+def test_append_fractional(fractional_dataset):
+    D = fractional_dataset
+    session = SiatecSession()
+    for end in range(0, len(D), 3):
+        session.append(D[end : end + 3])
+        assert session.results() == siatec(D[: end + 3])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_append_fraction_points(seed):
+    D = sorted(set(fraction_points(random.Random(seed), 30)))
+    session = SiatecSession()
+    for end in range(0, len(D), 4):
+        session.append(D[end : end + 4])
+        assert session.results() == siatec(D[: end + 4])
+
+
+def test_append_out_of_order(regular_dataset):
+    D = sorted(set(regular_dataset))
+    session = SiatecSession(D[1:])
+    with pytest.raises(RuntimeError):
+        session.append(D[:1])
+    with pytest.raises(RuntimeError):
+        session.append(D[-1:])
+    assert session.results() == siatec(D[1:])
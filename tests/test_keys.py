@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from ostinato.keys import PointCodec
+from ostinato.siatec import siatec
+
+
+def test_codec_vector_keys(mid_inv_elbow_dataset):
+    D = mid_inv_elbow_dataset
+    codec = PointCodec.fit(D)
+    K = codec.encode(D).tolist()
+    vectors = [
+        tuple(e - s for s, e in zip(start, end)) for start in D for end in D
+    ]
+    keys = [end - start for start in K for end in K]
+    assert codec.decode_vectors(keys) == vectors
+    assert [codec.encode_vector(v) for v in vectors] == keys
+    assert sorted(range(len(keys)), key=keys.__getitem__) == sorted(
+        range(len(vectors)), key=vectors.__getitem__
+    )
+
+
+def test_codec_fit():
+    assert PointCodec.fit([]) is None
+    assert PointCodec.fit([(0.5, 60), (1.0, 62)]) is None
+    assert PointCodec.fit([(0, 0), (2**40, 2**40)]) is None
+    codec = PointCodec.fit([(0.5, 60), (1.0, 62)], resolution=(0.25, 1))
+    assert codec.decode_vectors([codec.encode_vector((0.5, 2))]) == [(0.5, 2)]
+    with pytest.raises(RuntimeError):
+        PointCodec.fit([(0.5, 60)], resolution=(0.25, 1, 1))
+
+
+@pytest.mark.parametrize(
+    "name", ["elbow_dataset", "retro_dataset", "big_shifted_retro_dataset"]
+)
+def test_packed_engine(name, request):
+    D = request.getfixturevalue(name)
+    assert siatec(D, engine="packed") == siatec(D)
+
+
+def test_packed_engine_random():
+    rng = random.Random(11)
+    D = sorted({(rng.randint(-20, 20), rng.randint(0, 9)) for _ in range(50)})
+    assert siatec(D, engine="packed") == siatec(D)
+
+
+def test_packed_engine_resolution(regular_dataset):
+    D = [(x / 4, y) for x, y in regular_dataset]
+    TECs = siatec(D, engine="packed", resolution=(0.25, 1))
+    assert TECs == siatec(D)
+    with pytest.raises(RuntimeError):
+        siatec(D, engine="packed")
+    assert siatec(D, resolution=0.25) == TECs
+    with pytest.raises(RuntimeError):
+        siatec(D, engine="numpy", resolution=0.25)
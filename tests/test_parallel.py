@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from ostinato import parallel
+from ostinato.siatec import siatec, siatec_many
+
+
+def test_parallel_matches_serial(big_shifted_retro_dataset):
+    D = big_shifted_retro_dataset
+    assert siatec(D, workers=2) == siatec(D)
+    assert siatec(D, engine="numpy", workers=2) == siatec(D)
+
+
+def test_parallel_random_dataset():
+    rng = random.Random(7)
+    D = sorted({(rng.randint(0, 60), rng.randint(0, 12)) for _ in range(80)})
+    assert siatec(D, engine="numpy", workers=3) == siatec(D)
+
+
+def test_parallel_tiny_datasets():
+    assert siatec([], workers=2) == []
+    assert siatec([(1, 1)], workers=2) == []
+
+
+def test_split_work():
+    sizes = [1, 1, 1, 2, 2, 3, 8]
+    ranges = parallel.split_work(sizes, 4)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(sizes)
+    assert all(lo < hi for lo, hi in ranges)
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    assert parallel.split_work([], 4) == []
+
+
+def test_parallel_unsupported(elbow_dataset):
+    with pytest.raises(RuntimeError):
+        siatec(elbow_dataset, engine="indexed", workers=2)
+    with pytest.raises(RuntimeError):
+        siatec(elbow_dataset, engine="python", workers=2)
+    with pytest.raises(RuntimeError):
+        siatec(elbow_dataset, window=2, workers=2)
+
+
+def test_siatec_many(
+    regular_dataset, retro_dataset, big_shifted_retro_dataset
+):
+    datasets = [regular_dataset, [], retro_dataset, big_shifted_retro_dataset]
+    results = dict(siatec_many(datasets, workers=2, min_translators=2))
+    assert sorted(results) == list(range(len(datasets)))
+    for index, D in enumerate(datasets):
+        assert results[index] == siatec(D, min_translators=2)
+
+
+def test_siatec_many_compact(big_shifted_retro_dataset):
+    datasets = [big_shifted_retro_dataset] * 3
+    results = siatec_many(
+        datasets, workers=2, tasks_per_child=1, engine="numpy", compact=True
+    )
+    expected = siatec(big_shifted_retro_dataset, compact=True)
+    assert all(result == expected for _, result in results)
+
+
+def test_siatec_many_unsupported(elbow_dataset):
+    with pytest.raises(RuntimeError):
+        siatec_many([elbow_dataset], engine="fast")
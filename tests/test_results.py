@@ -0,0 +1,105 @@
+import sys
+
+import numpy as np
+import pytest
+
+from ostinato.results import TECSet
+from ostinato.siatec import siatec
+
+
+def list_nbytes(TECs):
+    size = sys.getsizeof(TECs)
+    for tec in TECs:
+        size += sys.getsizeof(tec) + sys.getsizeof(tec.__dict__)
+        for points in (tec.pattern, tec.translators):
+            size += sys.getsizeof(points)
+            size += sum(sys.getsizeof(p) for p in points)
+    return size
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_compact_siatec(engine, big_shifted_retro_dataset):
+    D = big_shifted_retro_dataset
+    TECs = siatec(D)
+    compact = siatec(D, engine=engine, compact=True)
+    assert isinstance(compact, TECSet)
+    assert len(compact) == len(TECs)
+    assert compact == TECs
+    assert [str(tec) for tec in compact] == [str(tec) for tec in TECs]
+    assert compact[-1] == TECs[-1]
+    assert compact.pattern_sizes().tolist() == [len(t.pattern) for t in TECs]
+    assert compact.nbytes * 10 < list_nbytes(TECs)
+
+
+def test_small_chunks(mid_inv_elbow_dataset):
+    TECs = siatec(mid_inv_elbow_dataset)
+    assert TECSet.from_TECs(TECs, chunk_points=3) == TECs
+
+
+def test_mixed_coordinate_types(tmp_path):
+    D = [(k, 60.5 + k % 3) for k in range(12)]
+    TECs = siatec(D)
+    compact = siatec(D, compact=True)
+    assert compact.patterns.dtype == np.float64
+    assert repr(list(compact)) == repr(TECs)
+    assert repr(list(compact.select([2, 0]))) == repr([TECs[2], TECs[0]])
+
+    compact.save(tmp_path / "tecs.bin")
+    assert repr(list(TECSet.load(tmp_path / "tecs.bin"))) == repr(TECs)
+
+
+def test_indexing(big_shifted_retro_dataset):
+    TECs = siatec(big_shifted_retro_dataset)
+    compact = siatec(big_shifted_retro_dataset, compact=True)
+    assert compact[np.int64(2)] == TECs[2]
+    assert isinstance(compact[1:6:2], TECSet)
+    assert compact[1:6:2] == TECs[1:6:2]
+    assert compact[::-1] == TECs[::-1]
+    with pytest.raises(TypeError):
+        compact["0"]
+
+
+def test_view_equality(mid_inv_elbow_dataset):
+    TECs = siatec(mid_inv_elbow_dataset)
+    view = siatec(mid_inv_elbow_dataset, compact=True)[0]
+    assert view == TECs[0] and TECs[0] == view
+    assert view != TECs[1]
+    assert view != "PATTERN" and view != None  # noqa: E711
+
+
+def test_empty_tec_set():
+    compact = siatec([(1, 1)], compact=True)
+    assert len(compact) == 0
+    with pytest.raises(IndexError):
+        compact[0]
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_and_load(mmap, tmp_path, big_shifted_retro_dataset):
+    compact = siatec(big_shifted_retro_dataset, compact=True)
+    compact.save(tmp_path / "tecs.bin")
+    loaded = TECSet.load(tmp_path / "tecs.bin", mmap=mmap)
+    assert isinstance(loaded.patterns, np.memmap) == mmap
+    assert loaded == compact
+    for name in ("patterns", "translator_offsets"):
+        assert getattr(loaded, name).dtype == getattr(compact, name).dtype
+
+    siatec([], compact=True).save(tmp_path / "empty.bin")
+    assert len(TECSet.load(tmp_path / "empty.bin")) == 0
+
+
+def test_load_foreign_file(tmp_path):
+    (tmp_path / "notes.txt").write_text("PATTERN: (1, 2)")
+    with pytest.raises(RuntimeError):
+        TECSet.load(tmp_path / "notes.txt")
+
+
+def test_select(tmp_path, big_shifted_retro_dataset):
+    TECs = siatec(big_shifted_retro_dataset)
+    siatec(big_shifted_retro_dataset, compact=True).save(tmp_path / "t.bin")
+    loaded = TECSet.load(tmp_path / "t.bin")
+
+    selected = loaded.select(loaded.translator_counts() >= 3)
+    assert selected == [tec for tec in TECs if len(tec.translators) >= 3]
+    assert loaded.select([4, 1]) == [TECs[4], TECs[1]]
+    assert len(loaded.select([])) == 0
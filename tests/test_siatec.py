@@ -1,6 +1,25 @@
+import random
+from collections.abc import Iterator
+from operator import add, sub
+
 import pytest
 
-from ostinato.siatec import siatec, TranslationalEquivalenceClass
+import ostinato.siatec as siatec_module
+
+from ostinato.siatec import (
+    siatec,
+    siatec_iter,
+    siatec_cross,
+    choose_engine,
+    mode_engine,
+    compute_sorted_vectors,
+    compute_vector_representations,
+    compute_vector_table,
+    compute_TEC_translators,
+    compute_TEC_translators_indexed,
+    PointIndex,
+    TranslationalEquivalenceClass,
+)
 
 
 def check_TECs(T):
@@ -88,3 +107,291 @@ def test_big_shifted_retro_dataset(big_shifted_retro_dataset):
 def test_geometric_data(geometric_data):
     TECs = siatec(geometric_data)
     check_TECs(TECs)
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "elbow_dataset",
+        "mid_inv_elbow_dataset",
+        "repeated_retro_dataset",
+        "big_shifted_retro_dataset",
+    ],
+)
+def test_indexed_engine(name, request):
+    D = request.getfixturevalue(name)
+    assert siatec(D, engine="indexed") == siatec(D)
+
+
+def test_indexed_translators(regular_dataset):
+    D = regular_dataset
+    _, W = compute_vector_table(D)
+    index = PointIndex.from_data(D)
+    for I in ([0, 1], [0, 5], [2, 3, 4]):
+        assert compute_TEC_translators_indexed(
+            D, index, I
+        ) == compute_TEC_translators(D, W, I)
+
+
+def W_translators(pattern, D):
+    # Translators as the W table engines match them, by the vectors q - p
+    vectors = [{tuple(map(sub, q, p)) for q in D} for p in pattern]
+    return sorted(set.intersection(*vectors))
+
+
+def test_indexed_engine_fractional(fractional_dataset):
+    D = fractional_dataset
+    assert siatec(D, engine="indexed") == siatec(D)
+    assert siatec(D, window=len(D), window_by="index") == siatec(D)
+    for tec in siatec(D, window=0.3):
+        assert sorted(tec.translators) == W_translators(tec.pattern, D)
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy", "indexed"])
+def test_siatec_iter(engine, mid_inv_elbow_dataset):
+    D = mid_inv_elbow_dataset
+    TECs = siatec_iter(D, engine=engine)
+    assert isinstance(TECs, Iterator)
+    assert list(TECs) == siatec(D)
+
+
+def test_siatec_iter_filters(mid_inv_elbow_dataset):
+    D = mid_inv_elbow_dataset
+    TECs = siatec_iter(
+        D,
+        filters=(
+            lambda tec: len(tec.pattern) >= 3,
+            lambda tec: len(tec.translators) >= 2,
+        ),
+    )
+    assert list(TECs) == [
+        tec
+        for tec in siatec(D)
+        if len(tec.pattern) >= 3 and len(tec.translators) >= 2
+    ]
+
+
+def check_valid_TECs(D, T):
+    points = set(D)
+    for tec in T:
+        for t in tec.translators:
+            assert {
+                tuple(p + d for p, d in zip(pt, t)) for pt in tec.pattern
+            } <= points
+
+
+@pytest.mark.parametrize("window_by", ["onset", "index"])
+def test_windowed_siatec(window_by, big_shifted_retro_dataset):
+    D = big_shifted_retro_dataset
+    TECs = siatec(D, window=4, window_by=window_by)
+    check_TECs(TECs)
+    check_valid_TECs(D, TECs)
+    assert len(TECs) < len(siatec(D))
+
+
+def test_full_window_matches_siatec(big_shifted_retro_dataset):
+    D = big_shifted_retro_dataset
+    assert siatec(D, window=len(D)) == siatec(D)
+    assert siatec(D, window=len(D), window_by="index") == siatec(D)
+
+
+def test_windowed_unsupported(elbow_dataset):
+    with pytest.raises(RuntimeError):
+        siatec(elbow_dataset, engine="numpy", window=2)
+    with pytest.raises(RuntimeError):
+        siatec(elbow_dataset, engine="python", window=2)
+    with pytest.raises(RuntimeError):
+        siatec(elbow_dataset, window=2, window_by="bars")
+
+
+def test_vector_representations_unique(repeated_retro_dataset):
+    D = repeated_retro_dataset
+    V = compute_sorted_vectors(D)
+    Y = compute_vector_representations(D, V)
+    shapes = [Q for _, Q in Y]
+    assert len(set(shapes)) == len(shapes)
+    assert shapes == sorted(shapes, key=lambda Q: (len(Q), Q))
+    for i, Q in Y:
+        # Every kept vector set is the first one in V with its shape
+        assert i == min(j for j, R in enumerate_vector_sets(D, V) if R == Q)
+
+
+def enumerate_vector_sets(D, V):
+    groups = dict()
+    for pos, (vec, idx) in enumerate(V):
+        groups.setdefault(vec, (pos, list()))[1].append(D[idx])
+    for pos, points in groups.values():
+        Q = tuple(
+            tuple(e - s for s, e in zip(a, b))
+            for a, b in zip(points, points[1:])
+        )
+        yield pos, Q
+
+
+@pytest.mark.parametrize(
+    "engine", ["python", "numpy", "indexed", "packed", "hash"]
+)
+def test_threshold_pushdown(engine, big_shifted_retro_dataset):
+    D = big_shifted_retro_dataset
+    TECs = siatec(D, engine=engine, min_pattern_size=3, min_translators=3)
+    assert TECs == [
+        tec
+        for tec in siatec(D)
+        if len(tec.pattern) >= 3 and len(tec.translators) >= 3
+    ]
+
+
+def test_threshold_skips_translator_search(monkeypatch, regular_dataset):
+    sizes = list()
+
+    def count_translators(D, W, I):
+        sizes.append(len(I))
+        return compute_TEC_translators(D, W, I)
+
+    monkeypatch.setattr(
+        siatec_module, "compute_TEC_translators", count_translators
+    )
+    TECs = siatec(regular_dataset, min_pattern_size=4)
+    assert all(len(tec.pattern) >= 4 for tec in TECs)
+    assert sizes and min(sizes) >= 4
+
+
+def test_threshold_windowed_and_parallel(big_shifted_retro_dataset):
+    D = big_shifted_retro_dataset
+    limits = dict(min_pattern_size=3, min_translators=2)
+    expected = siatec(D, **limits)
+    assert siatec(D, window=len(D), **limits) == expected
+    assert siatec(D, engine="numpy", workers=2, **limits) == expected
+
+
+def cross_MTPs(D1, D2):
+    lookup = set(D2)
+    return {
+        tuple(map(sub, q, p)): [
+            r for r in D1 if tuple(map(add, r, map(sub, q, p))) in lookup
+        ]
+        for p in D1
+        for q in D2
+    }
+
+
+def shape(P):
+    return tuple(tuple(map(sub, e, s)) for s, e in zip(P, P[1:]))
+
+
+def test_siatec_cross():
+    rng = random.Random(11)
+    motif = [(0, 0), (1, 3), (3, 1), (4, 4)]
+    D1 = {(rng.randint(0, 30), rng.randint(0, 8)) for _ in range(25)}
+    D2 = {(rng.randint(0, 40), rng.randint(0, 8)) for _ in range(30)}
+    D1 |= {(x + 5, y + 2) for x, y in motif}
+    D2 |= {(x + dx, y) for dx in (3, 20) for x, y in motif}
+    D1, D2 = sorted(D1), sorted(D2)
+
+    TECs = siatec_cross(D1, D2)
+    MTPs = [P for P in cross_MTPs(D1, D2).values() if len(P) >= 2]
+    assert all(tec.pattern in MTPs for tec in TECs)
+    assert sorted(shape(tec.pattern) for tec in TECs) == sorted(
+        set(map(shape, MTPs))
+    )
+    lookup = set(D2)
+    for tec in TECs:
+        assert tec.translators == sorted(
+            tuple(map(sub, q, tec.pattern[0]))
+            for q in D2
+            if all(
+                tuple(map(add, p, map(sub, q, tec.pattern[0]))) in lookup
+                for p in tec.pattern
+            )
+        )
+    motif_in_D1 = [(x + 5, y + 2) for x, y in motif]
+    assert any(set(motif_in_D1) <= set(tec.pattern) for tec in TECs)
+
+
+def test_siatec_cross_fractional(fractional_dataset):
+    D1, D2 = fractional_dataset[::2], fractional_dataset
+    TECs = siatec_cross(D1, D2)
+    check_TECs(TECs)
+    for tec in TECs:
+        assert sorted(tec.translators) == W_translators(tec.pattern, D2)
+
+
+def test_siatec_cross_thresholds(regular_dataset, retro_dataset):
+    TECs = siatec_cross(regular_dataset, retro_dataset)
+    limited = siatec_cross(
+        regular_dataset, retro_dataset, min_pattern_size=3, min_translators=2
+    )
+    assert limited == [
+        tec
+        for tec in TECs
+        if len(tec.pattern) >= 3 and len(tec.translators) >= 2
+    ]
+    assert siatec_cross([], retro_dataset) == []
+
+
+def test_tolerance_matches_exact(big_shifted_retro_dataset):
+    D = big_shifted_retro_dataset
+    assert siatec(D, tolerance=0.25) == siatec(D)
+
+
+def test_tolerance_absorbs_noise():
+    rng = random.Random(17)
+    D = sorted({(rng.randint(0, 30), rng.randint(0, 8)) for _ in range(40)})
+    noise = {x: rng.uniform(-1e-7, 1e-7) for x, _ in D}
+    N = sorted((x / 3 + noise[x], y) for x, y in D)
+
+    def occurrences(tec, scale=1):
+        # Noise can change which occurrence represents a TEC
+        return sorted(
+            sorted(
+                (round((x + dx) * scale), round(y + dy))
+                for x, y in tec.pattern
+            )
+            for dx, dy in tec.translators
+        )
+
+    expected = sorted(occurrences(tec) for tec in siatec(D))
+    found = sorted(
+        occurrences(tec, scale=3) for tec in siatec(N, tolerance=1e-6)
+    )
+    assert found == expected
+    assert len(siatec(N)) < len(expected)
+
+
+def test_tolerance_unsupported(elbow_dataset):
+    with pytest.raises(RuntimeError):
+        siatec(elbow_dataset, engine="numpy", tolerance=0.1)
+    with pytest.raises(RuntimeError):
+        siatec(elbow_dataset, window=2, tolerance=0.1)
+    with pytest.raises(RuntimeError):
+        siatec(elbow_dataset, tolerance=0)
+
+
+def test_auto_engine(big_shifted_retro_dataset, geometric_data):
+    for D in (big_shifted_retro_dataset, geometric_data):
+        assert siatec(D, engine="auto") == siatec(D)
+    assert siatec(big_shifted_retro_dataset, engine="auto", window=2) == (
+        siatec(big_shifted_retro_dataset, window=2)
+    )
+
+
+def test_choose_engine():
+    rng = random.Random(5)
+    small = sorted({(rng.randint(0, 5), rng.randint(0, 5)) for _ in range(8)})
+    sparse = sorted(
+        {(rng.randint(0, 999), rng.randint(0, 40)) for _ in range(60)}
+    )
+    dense = sorted({(x, y) for x in range(10) for y in range(8)})
+    fractional = [(x / 3, y) for x, y in sparse]
+
+    assert choose_engine(small).engine == "python"
+    assert choose_engine(sparse).engine == "numpy"
+    assert choose_engine(dense).engine == "hash"
+    assert choose_engine(fractional).engine == "numpy"
+    assert choose_engine(dense, workers=2).engine == "numpy"
+    assert choose_engine(dense, window=4).engine == "indexed"
+    assert choose_engine(dense, tolerance=0.1).engine == "python"
+    assert choose_engine(fractional, resolution=0.25).engine == "packed"
+    assert mode_engine(window=4).engine == "indexed"
+    assert mode_engine() is None
+    assert "dense" in choose_engine(dense).reason
@@ -0,0 +1,80 @@
+import tracemalloc
+
+import pytest
+
+from ostinato.cache import ResultCache
+from ostinato.siatec import choose_engine, siatec
+from ostinato.stats import SiatecStats, add_exporter, remove_exporter
+
+
+@pytest.mark.parametrize(
+    "engine", ["python", "numpy", "indexed", "packed", "hash"]
+)
+def test_siatec_stats(engine, big_shifted_retro_dataset):
+    D = big_shifted_retro_dataset
+    TECs, stats = siatec(D, engine=engine, stats=True, min_translators=2)
+    assert isinstance(stats, SiatecStats)
+    assert TECs == siatec(D, engine=engine, min_translators=2)
+    assert list(stats.phases) == [
+        "vector_table",
+        "vector_representations",
+        "translators",
+    ]
+    assert all(phase.peak_bytes > 0 for phase in stats.phases.values())
+    assert stats.seconds > 0
+
+    n = len(D)
+    assert stats.sizes["V"] == n * (n - 1) // 2
+    assert stats.sizes["T"] == len(TECs)
+    assert stats.sizes["Y"] >= len(TECs)
+    assert stats.counts["translator_searches"] == stats.sizes["Y"]
+    assert stats.counts["translators"] >= sum(
+        len(tec.translators) for tec in TECs
+    )
+    assert not tracemalloc.is_tracing()
+
+
+def test_stats_engine_choice(big_shifted_retro_dataset, geometric_data):
+    for D in (big_shifted_retro_dataset, geometric_data):
+        _, stats = siatec(D, engine="auto", stats=True)
+        choice = choose_engine(sorted(set(D)))
+        assert stats.engine == choice.engine
+        assert stats.engine_reason == choice.reason
+        assert stats.to_dict()["engine_reason"] == choice.reason
+
+    _, stats = siatec(geometric_data, engine="indexed", stats=True)
+    assert stats.engine == "indexed"
+    assert stats.engine_reason == "requested by the caller"
+
+    # Every mode records the engine it runs on, not the default one
+    modes = dict(
+        indexed=dict(window=2),
+        numpy=dict(workers=2),
+        packed=dict(resolution=1),
+        tolerant=dict(tolerance=0.1),
+    )
+    for engine, options in modes.items():
+        for requested in (None, "auto"):
+            _, stats = siatec(
+                geometric_data, engine=requested, stats=True, **options
+            )
+            assert stats.engine == engine
+
+
+def test_stats_exporter(tmp_path, regular_dataset):
+    exported = list()
+    add_exporter(exported.append)
+    try:
+        cache = ResultCache(tmp_path)
+        _, first = siatec(regular_dataset, cache=cache, stats=True)
+        _, second = siatec(regular_dataset, cache=cache, stats=True)
+    finally:
+        remove_exporter(exported.append)
+    siatec(regular_dataset, stats=True)
+
+    assert exported == [first, second]
+    assert first.counts["cache_hits"] == 0
+    assert second.counts["cache_hits"] == 1
+    assert "translators" not in second.phases
+    assert first.engine == "python" and second.engine is None
+    assert second.to_dict()["sizes"] == {"T": first.sizes["T"]}
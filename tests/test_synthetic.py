@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from ostinato.siatec import siatec
+from ostinato.synthetic import plant, recall
+from ostinato.utils import randomSampleSetsLinear
+
+
+def test_plant():
+    dataset = plant(150, motif_size=4, repeats=5, noise=0.3, seed=1)
+    D = dataset.points()
+    assert D == sorted(set(D))
+    assert D == dataset.points(chunk_width=7)
+    assert D == plant(150, motif_size=4, repeats=5, noise=0.3, seed=1).points()
+    assert 100 < len(D) <= 150
+
+    points = set(D)
+    TECs = dataset.tecs()
+    assert len(TECs) == 5
+    for tec in TECs:
+        assert len(tec.pattern) == 4
+        assert tec.translators[0] == (0, 0)
+        for dx, dy in tec.translators:
+            assert {(x + dx, y + dy) for x, y in tec.pattern} <= points
+
+
+def test_recall():
+    dataset = plant(150, motif_size=4, repeats=5, noise=0.3, seed=1)
+    D, TECs = dataset.points(), dataset.tecs()
+    assert recall(siatec(D), TECs) == 1.0
+    assert recall(siatec(D, engine="hash"), TECs) == 1.0
+    assert recall(siatec(D, window=2, window_by="index"), TECs) < 1.0
+    assert recall([], TECs) == 0.0
+
+
+def test_plant_stream():
+    dataset = plant(50_000, repeats=10, seed=2)
+    chunks = list(dataset.iter_chunks(chunk_width=500))
+    P = np.concatenate(chunks)
+    assert all(len(chunk) for chunk in chunks)
+    assert np.all(np.diff(P[:, 0] * dataset.height + P[:, 1]) > 0)
+    assert 45_000 < len(P) <= 50_000
+
+
+def test_plant_unsupported():
+    with pytest.raises(RuntimeError):
+        plant(100, noise=1.5)
+    with pytest.raises(RuntimeError):
+        plant(100, motif_size=100)
+
+
+def test_random_sample_sets():
+    np.random.seed(4)
+    datasets = randomSampleSetsLinear(10, 50, 20, density=0.1)
+    assert [len(D) for D in datasets] == [10, 30, 50]
+    for D in datasets:
+        assert len(set(D)) == len(D)
+        assert all(0 <= y < 12 for _, y in D)
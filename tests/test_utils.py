@@ -0,0 +1,41 @@
+from ostinato.siatec import TranslationalEquivalenceClass, siatec
+from ostinato.utils import (
+    compare_tec_sets,
+    diagnoseDiff,
+    fingerprint,
+    isEquivTecSets,
+)
+
+
+def test_fingerprint_ignores_representative():
+    tec = TranslationalEquivalenceClass([(0, 1), (1, 3)], [(0, 0), (4, 1)])
+    moved = TranslationalEquivalenceClass([(4, 2), (5, 4)], [(-4, -1), (0, 0)])
+    assert fingerprint(tec) == fingerprint(moved)
+    assert fingerprint(tec) == fingerprint((tec.pattern, tec.translators))
+    assert fingerprint(tec) != fingerprint((tec.pattern, [(0, 0)]))
+
+
+def test_compare_tec_sets(big_shifted_retro_dataset):
+    D = big_shifted_retro_dataset
+    TECs = siatec(D)
+    assert isEquivTecSets(TECs, list(reversed(TECs)))
+    assert isEquivTecSets(TECs, siatec(D, compact=True))
+
+    extra = TranslationalEquivalenceClass([(-5, 0), (-4, 0)], [(0, 0)])
+    diff = compare_tec_sets(TECs[1:] + [extra], TECs)
+    assert not diff.equal
+    assert diff.common == len(TECs) - 1
+    assert diff.only_first == [extra]
+    assert diff.only_second == [TECs[0]]
+    assert diff.missed_sizes() == [2]
+
+    diff = diagnoseDiff(TECs[1:] + [extra], TECs, D)
+    assert diff.outside_first == [extra]
+    assert diff.outside_second == []
+
+
+def test_compare_tec_sets_counts_repeats(retro_dataset):
+    TECs = siatec(retro_dataset)
+    diff = compare_tec_sets(TECs + TECs[:1], TECs)
+    assert diff.only_first == TECs[:1]
+    assert diff.common == len(TECs)
@@ -0,0 +1,61 @@
+import random
+
+import numpy as np
+import pytest
+
+from ostinato import siatec as siatec_module, vectorized
+from ostinato.siatec import siatec
+
+DATASETS = [
+    "elbow_dataset",
+    "v_dataset",
+    "retro_inv_dataset",
+    "mid_inv_elbow_dataset",
+    "repeated_retro_dataset",
+    "big_shifted_retro_dataset",
+    "geometric_data",
+]
+
+
+@pytest.mark.parametrize("name", DATASETS)
+def test_numpy_matches_python(name, request):
+    D = sorted(request.getfixturevalue(name))
+    assert siatec(D, engine="numpy") == siatec(D)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_numpy_matches_python_random(seed):
+    rng = random.Random(seed)
+    D = sorted({(rng.randint(0, 30), rng.randint(0, 8)) for _ in range(40)})
+    assert siatec(D, engine="numpy") == siatec(D)
+
+
+def test_numpy_float_coordinates():
+    D = [(0.0, 60), (0.5, 62), (1.25, 60), (1.75, 62), (2.5, 60), (3.0, 62)]
+    assert siatec(D, engine="numpy") == siatec(D)
+
+
+def test_numpy_tiny_datasets():
+    assert siatec([], engine="numpy") == []
+    assert siatec([(1, 1)], engine="numpy") == []
+
+
+def test_unknown_engine(elbow_dataset):
+    with pytest.raises(RuntimeError):
+        siatec(elbow_dataset, engine="fortran")
+
+
+def test_numpy_small_batches(monkeypatch, big_shifted_retro_dataset):
+    monkeypatch.setattr(vectorized, "BATCH_ELEMENTS", 1)
+    D = big_shifted_retro_dataset
+    assert siatec(D, engine="numpy") == siatec(D)
+
+
+def test_batched_translators(regular_dataset):
+    D = regular_dataset
+    table = vectorized.compute_vector_table(D)
+    _, W = siatec_module.compute_vector_table(D)
+    S = np.array([[0, 1], [0, 5], [2, 3]])
+    assert vectorized.compute_TEC_translators(table, S) == [
+        siatec_module.compute_TEC_translators(D, W, I) for I in S.tolist()
+    ]